@@ -0,0 +1,10 @@
+"""
+discord-styled-text - benchmarks
+---
+Offline benchmarks of the rendering and escaping hot paths.
+
+Run with ``python -m benchmarks`` from the root of the repository.
+
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
@@ -0,0 +1,90 @@
+"""
+discord-styled-text - benchmarks/__main__.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Dict
+
+from discord_styler import __version__
+
+from .cases import CASES
+
+
+def measure(name: str, min_time: float, repeat: int) -> Dict[str, float]:
+    func = CASES[name]()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        output = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    result = {"ops_per_sec": 1 / best, "peak_memory": peak}
+    # serialization cases return the data, so its size can be compared too
+    if isinstance(output, bytes):
+        result["output_size"] = len(output)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks the rendering and escaping hot paths")
+    parser.add_argument("patterns", nargs="*", default=["*"], help="glob patterns of the cases to run")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing runs, the best is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum duration of a timing run, in seconds")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results against a JSON baseline")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if any(fnmatch.fnmatch(name, pattern) for pattern in args.patterns)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+    results = {}
+    width = max(map(len, names), default=0)
+    header = f"{'case':<{width}}  {'ops/sec':>12}  {'peak memory':>12}"
+    if baseline:
+        header += "  {:>8}  {:>8}".format("speed", "memory")
+    print(header)
+    for name in names:
+        result = measure(name, args.min_time, args.repeat)
+        results[name] = result
+        line = f"{name:<{width}}  {result['ops_per_sec']:>12.2f}  {result['peak_memory'] / 1024:>10.1f}kB"
+        if name in baseline:
+            old = baseline[name]
+            line += f"  {result['ops_per_sec'] / old['ops_per_sec']:>7.2f}x"
+            line += f"  {result['peak_memory'] / max(old['peak_memory'], 1):>7.2f}x"
+        if "output_size" in result:
+            line += f"  ({result['output_size'] / 1024:.1f}kB output)"
+        print(line, flush=True)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"version": __version__, "python": platform.python_version(), "results": results},
+                      file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+discord-styled-text - benchmarks/cases.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import pickle
+import random
+from typing import Callable, Dict
+
+from discord_styler import (StyledText, Bold, Italic, Underline, Spoiler, BlockQuote, CodeBlock, TitledURL,
+                            NonEmbeddingURL, LinkList, UserMention, RoleMention, ChannelMention, TimeStamp, TimeStyle,
+                            escape_markdown, escape_mentions, escape_everything, to_tuple, to_bytes, from_bytes, Field,
+                            LiveMessage, Table, EscapeProfile, render_with_mentions, unescape_everything,
+                            strip_markdown, strip_markdown_many)
+
+
+# each case returns the function to time, so the setup is not measured
+CASES: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    def register(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+# ---- Corpora ----
+# generated from a fixed seed, so the results are comparable between runs
+
+def plain_corpus(size: int) -> str:
+    rng = random.Random(1)
+    words = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "discord", "message"]
+    out = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        out.append(word)
+        length += len(word) + 1
+    return " ".join(out)[:size]
+
+
+def markdown_corpus(size: int) -> str:
+    rng = random.Random(2)
+    pieces = ["**bold**", "*italic*", "__under__", "~~strike~~", "`code`", "||spoiler||", "\\*escaped\\*",
+              "\n> quote ", "\n>>> block ", "<t:1618953630:R>", "plain", "words"]
+    return _fill(rng, pieces, size)
+
+
+def mention_corpus(size: int) -> str:
+    rng = random.Random(3)
+    pieces = ["<@200102491231092736>", "<@!200102491231092736>", "<@&656893570711814145>", "<#656893570711814145>",
+              "@everyone", "@here", "hey", "look at this"]
+    return _fill(rng, pieces, size)
+
+
+def _fill(rng: random.Random, pieces, size: int) -> str:
+    out = []
+    length = 0
+    while length < size:
+        piece = rng.choice(pieces)
+        out.append(piece)
+        length += len(piece) + 1
+    return " ".join(out)
+
+
+# ---- Rendering ----
+
+class _NullWriter:
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def _recursive_str(obj: object) -> str:
+    """The recursive rendering of the nodes before the single-pass walk, as a reference for small trees"""
+    if isinstance(obj, StyledText) and not isinstance(obj, BlockQuote):
+        return obj._markup + obj._sep.join(map(_recursive_str, obj._objs)) + obj._markup
+    return str(obj)
+
+
+def small_message() -> StyledText:
+    return StyledText(Bold("Status"), Italic("all systems go"), UserMention(200102491231092736),
+                      TimeStamp(1618953630, TimeStyle.Relative), Underline("footer"), sep="\n")
+
+
+@case("render.small")
+def render_small():
+    node = small_message()
+    return lambda: str(node)
+
+
+@case("render.small_reference")
+def render_small_reference():
+    # compare with render.small: the overhead of rendering small trees
+    node = small_message()
+    return lambda: _recursive_str(node)
+
+
+@case("render.wide")
+def render_wide():
+    node = StyledText(*(Bold("item", i) if i % 2 else Italic("item", i) for i in range(10_000)))
+    return lambda: str(node)
+
+
+@case("render.deep")
+def render_deep():
+    styles = [Bold, Italic, Underline, Spoiler]
+    node = StyledText("core")
+    for i in range(5_000):
+        node = styles[i % 4](node, "level")
+    return lambda: str(node)
+
+
+@case("render.blockquote_lines")
+def render_blockquote_lines():
+    node = BlockQuote("\n".join(f"line {i}" for i in range(20_000)))
+    return lambda: str(node)
+
+
+@case("render.blockquote_nested")
+def render_blockquote_nested():
+    node = StyledText("\n".join(f"line {i}" for i in range(1_000)))
+    for _ in range(20):
+        node = BlockQuote(node)
+    return lambda: str(node)
+
+
+@case("render.codeblock_large")
+def render_codeblock_large():
+    node = CodeBlock(plain_corpus(4_000_000), lang="py")
+    return lambda: str(node)
+
+
+@case("render.stream_report")
+def render_stream_report():
+    # many large leaves, written out without building the whole text
+    node = StyledText(*(BlockQuote(Bold("section", i), CodeBlock(plain_corpus(100_000))) for i in range(40)), sep="\n")
+    return lambda: node.render_to(_NullWriter())
+
+
+@case("render.live_edit")
+def render_live_edit():
+    # a dashboard of 1 000 rows, editing one of them between renders
+    fields = [Field(i) for i in range(1_000)]
+    live = LiveMessage(StyledText(*(Bold("row", i, Italic(field)) for i, field in enumerate(fields)), sep="\n"))
+    live.render()
+    counter = iter(range(10**9))
+
+    def edit():
+        fields[500].value = next(counter)
+        return live.render()
+    return edit
+
+
+@case("render.table_pages")
+def render_table_pages():
+    # a leaderboard, split into messages
+    rows = [(i, f"player{i}", i * 37 % 1000, "東京" if i % 3 else "Paris") for i in range(5_000)]
+    return lambda: list(Table(rows, header=("#", "name", "score", "city"), align="><>").pages())
+
+
+@case("render.with_mentions")
+def render_with_mentions_budget():
+    # a busy announcement, with more pings than allowed
+    node = StyledText(*(Bold("to", UserMention(200102491231092736 + i % 300), RoleMention(656893570711814145 + i % 7))
+                        for i in range(1_000)))
+    return lambda: render_with_mentions(node, 50)
+
+
+@case("build.mentions")
+def build_mentions():
+    return lambda: [UserMention(200102491231092736 + i) for i in range(1_000)] + \
+        [RoleMention(656893570711814145 + i) for i in range(1_000)]
+
+
+@case("build.links")
+def build_links():
+    # feed entries, many of them linking to the same pages
+    links = [(f"entry {i} [{i % 7}]", f"https://miaow.io/feed/{i % 100}") for i in range(1_000)]
+    return lambda: str(LinkList(links))
+
+
+@case("build.timestamps")
+def build_timestamps():
+    return lambda: [str(TimeStamp(1618953630 + i, TimeStyle.Relative)) for i in range(1_000)]
+
+
+# ---- Escaping ----
+
+def _escape_cases(name: str, make: Callable[[], str]) -> None:
+    for func in (escape_markdown, escape_mentions, escape_everything):
+        def setup(func=func):
+            text = make()
+            return lambda: func(text)
+        case(f"{func.__name__}.{name}")(setup)
+
+
+_escape_cases("plain_ascii", lambda: plain_corpus(100_000))
+_escape_cases("markdown_heavy", lambda: markdown_corpus(100_000))
+_escape_cases("mention_heavy", lambda: mention_corpus(100_000))
+_escape_cases("multi_mb", lambda: markdown_corpus(1_000_000) + plain_corpus(3_000_000))
+
+
+@case("EscapeProfile.markdown_heavy")
+def escape_profile_markdown_heavy():
+    profile = EscapeProfile(markdown=True, blockquotes=True, timestamps=True, headers=True, subtext=True, lists=True,
+                            links=True, everyone=True, mentions=True, channels=True)
+    text = markdown_corpus(100_000)
+    return lambda: profile(text)
+
+
+@case("unescape_everything.markdown_heavy")
+def unescape_markdown_heavy():
+    text = escape_everything(markdown_corpus(100_000) + mention_corpus(100_000))
+    return lambda: unescape_everything(text)
+
+
+@case("strip_markdown.markdown_heavy")
+def strip_markdown_heavy():
+    text = markdown_corpus(100_000)
+    return lambda: strip_markdown(text)
+
+
+@case("strip_markdown_many.messages")
+def strip_markdown_messages():
+    # short messages, like when indexing a channel history
+    corpus = markdown_corpus(200_000)
+    texts = [corpus[i:i + 200] for i in range(0, len(corpus), 200)]
+    return lambda: strip_markdown_many(texts)
+
+
+# ---- Serialization ----
+# what sending personalized messages to a process pool costs, compared to rendering them
+
+def _broadcast():
+    return [StyledText(Bold("Hello", UserMention(200102491231092736 + i)), "your **report** is ready",
+                       TimeStamp(1618953630 + i, TimeStyle.Relative), escape=True) for i in range(1_000)]
+
+
+@case("serialize.render")
+def serialize_render():
+    nodes = _broadcast()
+    return lambda: [str(node) for node in nodes]
+
+
+@case("serialize.pickle_nodes")
+def serialize_pickle_nodes():
+    nodes = _broadcast()
+    return lambda: pickle.loads(pickle.dumps(nodes))
+
+
+@case("serialize.pickle_tuples")
+def serialize_pickle_tuples():
+    nodes = _broadcast()
+    return lambda: pickle.loads(pickle.dumps([to_tuple(node) for node in nodes]))
+
+
+def _digest():
+    # a cached digest of feed entries, sharing the same footer and links
+    footer = StyledText(Bold("Posted by"), UserMention(200102491231092736), NonEmbeddingURL("https://miaow.io/feed"))
+    return StyledText(*(BlockQuote(Bold(f"Entry {i}"), TimeStamp(1618953630 + i * 60, TimeStyle.Relative), footer,
+                                   sep="\n") for i in range(1_000)), sep="\n")
+
+
+@case("serialize.to_bytes")
+def serialize_to_bytes():
+    node = _digest()
+    return lambda: to_bytes(node)
+
+
+@case("serialize.from_bytes")
+def serialize_from_bytes():
+    data = to_bytes(_digest())
+    return lambda: from_bytes(data)
+
+
+@case("serialize.pickle_dumps")
+def serialize_pickle_dumps():
+    node = _digest()
+    return lambda: pickle.dumps(node)
+
+
+@case("serialize.pickle_loads")
+def serialize_pickle_loads():
+    data = pickle.dumps(_digest())
+    return lambda: pickle.loads(data)
+
+
+# ---- Memory ----
+# peak memory of 10 000 live nodes of each type, divide by 10 000 for the size of a node
+
+def _node_cases() -> None:
+    factories = {
+        "StyledText": lambda i: StyledText("a", "b"),
+        "Bold": lambda i: Bold("a"),
+        "BlockQuote": lambda i: BlockQuote("a"),
+        "CodeBlock": lambda i: CodeBlock("a", "py"),
+        "TitledURL": lambda i: TitledURL("a", "https://miaow.io"),
+        "NonEmbeddingURL": lambda i: NonEmbeddingURL("https://miaow.io"),
+        "UserMention": lambda i: UserMention(200102491231092736 + i),
+        "UserMention_repeated": lambda i: UserMention(200102491231092736 + i % 10),
+        "RoleMention": lambda i: RoleMention(656893570711814145 + i),
+        "ChannelMention": lambda i: ChannelMention(656893570711814145 + i),
+        "TimeStamp": lambda i: TimeStamp(1618953630 + i, TimeStyle.Relative),
+    }
+    for name, factory in factories.items():
+        def setup(factory=factory):
+            return lambda: [factory(i) for i in range(10_000)]
+        case(f"nodes.{name}")(setup)
+
+
+_node_cases()
@@ -9,9 +9,22 @@ Released under the terms of the BSD 3-Clause license.
 
 
 from .__info__ import __version__
+from .styler import MarkupNode, NodeCache, interned
 from .styler import StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler, BlockQuote
 from .styler import CodeBlock
-from .styler import TitledURL, NonEmbeddingURL
+from .styler import TitledURL, NonEmbeddingURL, LinkList
 from .styler import MentionABC, UserMention, RoleMention, ChannelMention
 from .styler import TimeStyle, TimeStamp
-from .escape import escape_markdown, escape_mentions, escape_everything
+from .escape import (escape_markdown, escape_mentions, escape_everything, EscapeProfile, IncrementalEscaper,
+                     unescape_markdown, unescape_mentions, unescape_everything, unescape_many, strip_markdown,
+                     strip_markdown_many)
+from .pagination import MESSAGE_LIMIT, paginate
+from .template import Slot, Template
+from .extract import SpanKind, Span, extract_spans, iter_spans
+from .parse import parse_markdown, iter_parse_markdown
+from .instrument import Stats, instrumented
+from .serialize import to_tuple, from_tuple, to_bytes, from_bytes
+from .bulk import render_many, render_many_async
+from .live import Field, LiveMessage
+from .table import Table
+from .mentions import render_with_mentions
@@ -0,0 +1,87 @@
+"""
+discord-styled-text - bulk.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Iterable, List, Optional
+
+from .serialize import to_tuple, from_tuple
+
+
+__all__ = [
+    "render_many",
+    "render_many_async",
+]
+
+
+def render_many(nodes: Iterable[Any], executor: Executor = None, *, chunksize: int = 256) -> List[str]:
+    """Renders many nodes, optionally spreading the work over a pool of processes or threads
+
+    The nodes are sent to the pool in chunks. Nodes sent to processes are encoded with :func:`to_tuple`,
+    which costs much less than rendering them. The escaping of nodes made with ``escape=True``
+    is done in the pool too.
+
+    .. code-block:: python
+
+        >>> with ProcessPoolExecutor() as pool:
+        ...     messages = render_many((Bold("Hi", UserMention(id)) for id in ids), pool)
+
+    :param nodes: The nodes (or any other objects) to render
+    :param executor: The pool to render the nodes with, like a :class:`~concurrent.futures.ProcessPoolExecutor`.
+        The nodes are rendered in the calling thread if absent
+    :param chunksize: The number of nodes sent to the pool at once
+    :return: the rendered text of each node, in the same order as the nodes
+    """
+    if executor is None:
+        return [str(node) for node in nodes]
+    encode = _encodes(executor)
+    futures = [executor.submit(_render_chunk, chunk, encode) for chunk in _chunks(nodes, chunksize, encode)]
+    return list(chain.from_iterable(future.result() for future in futures))
+
+
+async def render_many_async(nodes: Iterable[Any], executor: Executor = None, *, chunksize: int = 256) -> List[str]:
+    """Renders many nodes in a pool of processes or threads, without blocking the event loop
+
+    Works like :func:`render_many`, except that the nodes are rendered in the default executor
+    of the event loop if ``executor`` is absent.
+
+    .. code-block:: python
+
+        >>> messages = await render_many_async(nodes, pool)
+    """
+    loop = asyncio.get_event_loop()
+    encode = _encodes(executor)
+    futures = [loop.run_in_executor(executor, _render_chunk, chunk, encode)
+               for chunk in _chunks(nodes, chunksize, encode)]
+    return list(chain.from_iterable(await asyncio.gather(*futures)))
+
+
+def _encodes(executor: Optional[Executor]) -> bool:
+    """Whether the nodes must be encoded to be sent to the pool"""
+    # threads (including the default executor of the event loop) share the nodes, other pools need them pickled
+    return executor is not None and not isinstance(executor, ThreadPoolExecutor)
+
+
+def _chunks(nodes: Iterable[Any], chunksize: int, encode: bool) -> Iterable[List[Any]]:
+    if chunksize < 1:
+        raise ValueError("The chunk size must be at least 1")
+    chunk: List[Any] = []
+    for node in nodes:
+        chunk.append(to_tuple(node) if encode else node)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _render_chunk(chunk: List[Any], decode: bool) -> List[str]:
+    if decode:
+        return [str(from_tuple(node)) for node in chunk]
+    return [str(node) for node in chunk]
@@ -6,12 +6,25 @@ Released under the terms of the BSD 3-Clause license.
 """
 
 import re
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, Iterable, List, Match, Pattern, Tuple, cast
+
+from . import instrument
 
 
 __all__ = [
     "escape_markdown",
     "escape_mentions",
     "escape_everything",
+    "EscapeProfile",
+    "IncrementalEscaper",
+    "unescape_markdown",
+    "unescape_mentions",
+    "unescape_everything",
+    "unescape_many",
+    "strip_markdown",
+    "strip_markdown_many",
 ]
 
 
@@ -29,6 +42,134 @@ MENTION_SUB = "<\\g<1>\u200b\\g<2>>"  # this cannot be a raw string because of t
 EVERYONE_HERE_RE = re.compile(r"@(everyone|here)", flags=re.IGNORECASE)
 EVERYONE_HERE_SUB = "@\u200b\\g<1>"  # this cannot be a raw string because of the \u200b
 
+# only used by EscapeProfile
+CHANNEL_RE = re.compile(r"<(#)([0-9]+)>")
+HEADER_RE = re.compile(r"^#(?=#{0,2} )", flags=re.MULTILINE)
+SUBTEXT_RE = re.compile(r"^-(?=# )", flags=re.MULTILINE)
+LIST_RE = re.compile(r"^[ \t]*(?:[-*]|[0-9]+\.)(?= )", flags=re.MULTILINE)
+MASKED_LINK_RE = re.compile(r"(?<!\\)(?:\\\\)*\[(?=[^\[\]\n]*\]\()")
+
+# the escapes added by the rules above
+UNESCAPE_INLINE_MD_RE = re.compile(r"(?<!\\)(?:\\\\)*\\(?=[_*~|`])")
+UNESCAPE_BLOCKQUOTE_RE = re.compile(r"^\\>(?=(>>)? )", flags=re.MULTILINE)
+UNESCAPE_TIMESTAMP_RE = re.compile(r"\\(?=" + TIMESTAMP_RE.pattern + ")")
+UNESCAPE_USER_ROLE_CHANNEL_RE = re.compile(r"<(@[!&]?|#)\u200b([0-9]+)>")
+UNESCAPE_USER_ROLE_RE = re.compile(r"<(@[!&]?)\u200b([0-9]+)>")
+UNESCAPE_EVERYONE_HERE_RE = re.compile(r"@\u200b(everyone|here)", flags=re.IGNORECASE)
+
+INLINE_MD_CHARS = "_*~|`"
+
+
+# the escaping rules, and the characters any text they match contains
+_RULES: Dict[str, Tuple[str, str]] = {
+    "md": (INLINE_MD_RE.pattern, INLINE_MD_CHARS),
+    "bq": (BLOCKQUOTE_RE.pattern, ">"),
+    "ts": (TIMESTAMP_RE.pattern, "<"),
+    "header": (HEADER_RE.pattern, "#"),
+    "subtext": (SUBTEXT_RE.pattern, "-"),
+    "list": (LIST_RE.pattern, "-*."),
+    "link": (MASKED_LINK_RE.pattern, "["),
+    "eh": ("(?i:" + EVERYONE_HERE_RE.pattern + ")", "@"),
+    "mention": (USER_ROLE_RE.pattern, "<"),
+    "channel": (CHANNEL_RE.pattern, "<"),
+}
+
+
+@lru_cache(maxsize=None)
+def _compile(names: Tuple[str, ...]) -> Tuple[Pattern, Pattern]:
+    """Combines escaping rules into a single pattern
+
+    The rules never match overlapping text, so applying them all in one scan gives the same result as applying
+    them one after the other. Compiled patterns are kept for the lifetime of the process.
+
+    :param names: The names of the rules, in the order of :data:`_RULES`
+    :return: the combined pattern, and a pattern matching the characters any of the rules needs
+    """
+    rules = [(name, _RULES[name][0]) for name in names]
+    if "mention" in names and "channel" in names:
+        # a single rule, so the mentions are counted together by the instrumentation
+        rules.remove(("channel", CHANNEL_RE.pattern))
+        rules[rules.index(("mention", USER_ROLE_RE.pattern))] = ("mention", USER_ROLE_CHANNEL_RE.pattern)
+    elif "channel" in names:
+        rules[rules.index(("channel", CHANNEL_RE.pattern))] = ("mention", CHANNEL_RE.pattern)
+    if not rules:
+        never = re.compile("(?!)")
+        return never, never
+    triggers = "".join(sorted(set("".join(_RULES[name][1] for name in names))))
+    pattern = re.compile("|".join(f"(?P<{name}>{rule})" for name, rule in rules), flags=re.MULTILINE)
+    return pattern, re.compile("[" + re.escape(triggers) + "]")
+
+
+@lru_cache(maxsize=None)
+def _fused(markdown: bool, esc_timestamps: bool, mentions: bool, esc_channels: bool) -> Tuple[Pattern, Pattern]:
+    """Combines the escaping rules of the escaping functions into a single pattern, with :func:`_compile`"""
+    names = []
+    if markdown:
+        names += ["md", "bq"]
+        if esc_timestamps:
+            names.append("ts")
+    if mentions:
+        names += ["eh", "mention"]
+        if esc_channels:
+            names.append("channel")
+    return _compile(tuple(names))
+
+
+def _fused_sub(match: Match) -> str:
+    text = match.group()
+    kind = match.lastgroup
+    if kind == "md" or kind == "list" or kind == "link":
+        return text[:-1] + "\\" + text[-1]
+    if kind == "eh":
+        return "@\u200b" + text[1:]
+    if kind == "mention":
+        i = 3 if text[2] in "!&" else 2
+        return text[:i] + "\u200b" + text[i:]
+    # blockquotes, timestamps, headers, and subtext
+    return "\\" + text
+
+
+# names of the rules in the instrumentation counters
+_RULE_NAMES = {
+    "md": "markdown",
+    "bq": "blockquote",
+    "ts": "timestamp",
+    "eh": "everyone_here",
+    "mention": "mention",
+    "header": "header",
+    "subtext": "subtext",
+    "list": "list",
+    "link": "link",
+}
+
+
+def _escape(text: str, markdown: bool, esc_timestamps: bool, mentions: bool, esc_channels: bool) -> str:
+    pattern, triggers = _fused(markdown, esc_timestamps, mentions, esc_channels)
+    if instrument.active is not None:
+        name = "escape_everything" if markdown and mentions else "escape_markdown" if markdown else "escape_mentions"
+        return _escape_instrumented(text, pattern, triggers, name)
+    # text without any special characters is returned as is, without being copied
+    if triggers.search(text) is None:
+        return text
+    return pattern.sub(_fused_sub, text)
+
+
+def _escape_instrumented(text: str, pattern: Pattern, triggers: Pattern, name: str) -> str:
+    """Same as :func:`_escape`, counting the substitutions of each rule"""
+    start = perf_counter()
+    rules: Dict[str, int] = {group: 0 for group in pattern.groupindex if group in _RULE_NAMES}
+
+    def counting_sub(match: Match) -> str:
+        rules[cast(str, match.lastgroup)] += 1
+        return _fused_sub(match)
+
+    escaped = text if triggers.search(text) is None else pattern.sub(counting_sub, text)
+    stats = instrument.active
+    if stats is not None:
+        stats.record_escape(name, {_RULE_NAMES[group]: count for group, count in rules.items()}, len(text),
+                            perf_counter() - start)
+    return escaped
+
 
 def escape_markdown(text: str, *, esc_timestamps: bool = True) -> str:
     """Utility function to escape markdown-like formatting in a string
@@ -36,11 +177,7 @@ def escape_markdown(text: str, *, esc_timestamps: bool = True) -> str:
     :param text: the text to escape
     :param esc_timestamps: whether to escape timestamp formatting in the text
     """
-    text = re.sub(INLINE_MD_RE, INLINE_MD_SUB, text)
-    text = re.sub(BLOCKQUOTE_RE, GENERIC_SUB, text)
-    if esc_timestamps:
-        text = re.sub(TIMESTAMP_RE, GENERIC_SUB, text)
-    return text
+    return _escape(text, True, esc_timestamps, False, False)
 
 
 def escape_mentions(text: str, *, esc_channels: bool = True) -> str:
@@ -53,23 +190,373 @@ def escape_mentions(text: str, *, esc_channels: bool = True) -> str:
     :param text: the text to escape
     :param esc_channels: whether to escape channel mentions in the text
     """
-    text = re.sub(EVERYONE_HERE_RE, EVERYONE_HERE_SUB, text)
-    if esc_channels:
-        text = re.sub(USER_ROLE_CHANNEL_RE, MENTION_SUB, text)
-    else:
-        text = re.sub(USER_ROLE_RE, MENTION_SUB, text)
-    return text
+    return _escape(text, False, False, True, esc_channels)
 
 
 def escape_everything(text: str, *, esc_timestamps: bool = True, esc_channels: bool = True) -> str:
     """Utility function to escape all special formatting and mentions
 
-    Exactly the same as running both :func:`escape_markdown` and :func:`escape_mentions`.
-    Provided as a convenience shortcut.
+    Exactly the same as running both :func:`escape_markdown` and :func:`escape_mentions`,
+    but done in a single scan of the text.
 
     :param text: the text to escape
     :param esc_timestamps: whether to escape timestamp formatting in the text
     :param esc_channels: whether to escape channel mentions in the text
     """
-    return escape_mentions(escape_markdown(text, esc_timestamps=esc_timestamps),
-                           esc_channels=esc_channels)
+    return _escape(text, True, esc_timestamps, True, esc_channels)
+
+
+class EscapeProfile:
+    """Escapes exactly the selected constructs, in a single scan of the text
+
+    Each selection of constructs is compiled once into a single pattern, shared by all the profiles
+    selecting the same constructs for the lifetime of the process. Profiles are meant to be made once,
+    like at import time, and called for each text.
+
+    .. code-block:: python
+
+        >>> escape = EscapeProfile(markdown=True, headers=True, links=True, everyone=True)
+        >>> escape("# **Hi** @everyone, see [this](https://miaow.io) <@1234>")
+        '\\\\# \\\\*\\\\*Hi\\\\*\\\\* @\\u200beveryone, see \\\\[this](https://miaow.io) <@1234>'
+
+    :param markdown: whether to escape inline markdown (``*``, ``_``, ``~``, ``|``, and backticks),
+        like :func:`escape_markdown`
+    :param blockquotes: whether to escape block quotes (``>`` and ``>>>``)
+    :param timestamps: whether to escape timestamps
+    :param headers: whether to escape headers (``#``, ``##``, and ``###``)
+    :param subtext: whether to escape subtext (``-#``)
+    :param lists: whether to escape the markers of bulleted (``-`` and ``*``) and numbered (``1.``) lists
+    :param links: whether to escape masked links (``[text](url)``)
+    :param everyone: whether to escape ``@everyone`` and ``@here``
+    :param mentions: whether to escape user and role mentions
+    :param channels: whether to escape channel mentions
+    """
+    __slots__ = ("__pattern", "__triggers")
+
+    def __init__(self, *, markdown: bool = False, blockquotes: bool = False, timestamps: bool = False,
+                 headers: bool = False, subtext: bool = False, lists: bool = False, links: bool = False,
+                 everyone: bool = False, mentions: bool = False, channels: bool = False):
+        selected = (("md", markdown), ("bq", blockquotes), ("ts", timestamps), ("header", headers),
+                    ("subtext", subtext), ("list", lists), ("link", links), ("eh", everyone),
+                    ("mention", mentions), ("channel", channels))
+        self.__pattern, self.__triggers = _compile(tuple(name for name, selected in selected if selected))
+
+    def __call__(self, text: str) -> str:
+        """Escapes the text
+
+        :param text: the text to escape
+        """
+        if instrument.active is not None:
+            return _escape_instrumented(text, self.__pattern, self.__triggers, "EscapeProfile")
+        if self.__triggers.search(text) is None:
+            return text
+        return self.__pattern.sub(_fused_sub, text)
+
+    def escape_many(self, texts: Iterable[str]) -> List[str]:
+        """Escapes many texts at once
+
+        :param texts: the texts to escape
+        """
+        return [self(text) for text in texts]
+
+
+# text at the end of a chunk that could be completed into something to escape by the next chunk
+PARTIAL_LT_RE = re.compile(r"<(?:t(?::[0-9]*(?::[a-zA-Z]?)?)?|@[!&]?[0-9]*|#[0-9]*)?\Z")
+PARTIAL_EVERYONE_HERE_RE = re.compile(r"@(?:e(?:v(?:e(?:r(?:y(?:o(?:n)?)?)?)?)?)?|h(?:e(?:r)?)?)?\Z",
+                                      flags=re.IGNORECASE)
+PARTIAL_BLOCKQUOTE_RE = re.compile(r"(?<=\n)>{1,3}\Z")
+
+
+class IncrementalEscaper:
+    """Escapes text that arrives in chunks
+
+    The output is exactly the same as escaping all the chunks joined together in a single call,
+    even when something to escape is split between two chunks. Only the end of a chunk that could
+    still turn into something to escape is held back until the next chunk (or :meth:`flush`).
+
+    .. code-block:: python
+
+        >>> escaper = IncrementalEscaper()
+        >>> escaper.feed("ping <@12") + escaper.feed("34> **now**") + escaper.flush()
+        'ping <@\u200b1234> \\\\*\\\\*now\\\\*\\\\*'
+
+    :param markdown: whether to escape markdown-like formatting, like :func:`escape_markdown`
+    :param mentions: whether to escape mentions, like :func:`escape_mentions`
+    :param esc_timestamps: whether to escape timestamp formatting in the text
+    :param esc_channels: whether to escape channel mentions in the text
+    """
+    def __init__(self, *, markdown: bool = True, mentions: bool = True,
+                 esc_timestamps: bool = True, esc_channels: bool = True):
+        self.__pattern, self.__triggers = _fused(markdown, esc_timestamps, mentions, esc_channels)
+        self.__held = ""
+        # the character before the held text, which the rules can look behind at
+        # a newline stands for the beginning of the text
+        self.__context = "\n"
+
+    def feed(self, chunk: str) -> str:
+        """Escapes a chunk of text
+
+        :param chunk: the next chunk of the text
+        :return: the escaped text that can be sent so far, possibly empty
+        """
+        text = self.__held + chunk
+        cut = len(text)
+        for start in (text.rfind("<"), text.rfind("@")):
+            if start >= 0 and start < cut and (PARTIAL_LT_RE.match(text, start)
+                                               or PARTIAL_EVERYONE_HERE_RE.match(text, start)):
+                cut = start
+        tail = text[-4:] if len(text) >= 4 else self.__context + text
+        partial = PARTIAL_BLOCKQUOTE_RE.search(tail)
+        if partial is not None:
+            cut = min(cut, len(text) - len(tail) + partial.start())
+
+        if cut == len(text):
+            # backslashes only change how the next character is escaped, and only their parity matters
+            run = len(text) - len(text.rstrip("\\"))
+            if run:
+                cut -= run % 2
+                escaped = self.__escape(text[:cut])
+                self.__held = text[cut:]
+                # stands for the even run of backslashes already sent
+                self.__context = "\0"
+                return escaped
+        escaped = self.__escape(text[:cut])
+        if cut:
+            self.__context = text[cut - 1]
+        self.__held = text[cut:]
+        return escaped
+
+    def flush(self) -> str:
+        """Escapes the text held back so far, and starts over as if for a new text
+
+        :return: the remaining escaped text
+        """
+        escaped = self.__escape(self.__held)
+        self.__held = ""
+        self.__context = "\n"
+        return escaped
+
+    def __escape(self, text: str) -> str:
+        if not text or self.__triggers.search(text) is None:
+            return text
+        text = self.__context + text
+        out: List[str] = []
+        last = 1
+        for match in self.__pattern.finditer(text, 1):
+            out.append(text[last:match.start()])
+            out.append(_fused_sub(match))
+            last = match.end()
+        out.append(text[last:])
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def _fused_unescape(markdown: bool, esc_timestamps: bool, mentions: bool,
+                    esc_channels: bool) -> Tuple[Pattern, Pattern]:
+    """Combines the selected unescaping rules into a single pattern, like :func:`_fused`
+
+    :return: the combined pattern, and a pattern matching the characters any of the rules start with
+    """
+    rules = []
+    triggers = ""
+    if markdown:
+        rules += [("md", UNESCAPE_INLINE_MD_RE.pattern), ("bq", UNESCAPE_BLOCKQUOTE_RE.pattern)]
+        if esc_timestamps:
+            rules.append(("ts", UNESCAPE_TIMESTAMP_RE.pattern))
+        triggers += "\\"
+    if mentions:
+        rules.append(("eh", "(?i:" + UNESCAPE_EVERYONE_HERE_RE.pattern + ")"))
+        rules.append(("mention", (UNESCAPE_USER_ROLE_CHANNEL_RE if esc_channels else UNESCAPE_USER_ROLE_RE).pattern))
+        triggers += "\u200b"
+    pattern = re.compile("|".join(f"(?P<{name}>{rule})" for name, rule in rules), flags=re.MULTILINE)
+    return pattern, re.compile("[" + re.escape(triggers) + "]")
+
+
+def _fused_unsub(match: Match) -> str:
+    text = match.group()
+    kind = match.lastgroup
+    if kind == "md":
+        return text[:-1]
+    if kind == "eh":
+        return "@" + text[2:]
+    if kind == "mention":
+        return text.replace("\u200b", "")
+    # blockquotes and timestamps
+    return text[1:]
+
+
+def _unescape(text: str, markdown: bool, esc_timestamps: bool, mentions: bool, esc_channels: bool) -> str:
+    pattern, triggers = _fused_unescape(markdown, esc_timestamps, mentions, esc_channels)
+    if triggers.search(text) is None:
+        return text
+    return pattern.sub(_fused_unsub, text)
+
+
+def unescape_markdown(text: str, *, esc_timestamps: bool = True) -> str:
+    """Utility function to remove the escapes added by :func:`escape_markdown`
+
+    ``unescape_markdown(escape_markdown(text)) == text`` holds for any text without already escaped
+    formatting, since escaping leaves it as is. Like a backslash before a formatting character, or before
+    a ``>`` starting a line.
+
+    :param text: the text to unescape
+    :param esc_timestamps: whether timestamp formatting was escaped in the text
+    """
+    return _unescape(text, True, esc_timestamps, False, False)
+
+
+def unescape_mentions(text: str, *, esc_channels: bool = True) -> str:
+    """Utility function to remove the escapes added by :func:`escape_mentions`
+
+    ``unescape_mentions(escape_mentions(text)) == text`` holds for any text without mentions already
+    containing a zero-width space (``\\u200b``).
+
+    :param text: the text to unescape
+    :param esc_channels: whether channel mentions were escaped in the text
+    """
+    return _unescape(text, False, False, True, esc_channels)
+
+
+def unescape_everything(text: str, *, esc_timestamps: bool = True, esc_channels: bool = True) -> str:
+    """Utility function to remove the escapes added by :func:`escape_everything`
+
+    Exactly the same as running both :func:`unescape_markdown` and :func:`unescape_mentions`,
+    but done in a single scan of the text.
+
+    :param text: the text to unescape
+    :param esc_timestamps: whether timestamp formatting was escaped in the text
+    :param esc_channels: whether channel mentions were escaped in the text
+    """
+    return _unescape(text, True, esc_timestamps, True, esc_channels)
+
+
+def unescape_many(texts: Iterable[str], *, markdown: bool = True, mentions: bool = True,
+                  esc_timestamps: bool = True, esc_channels: bool = True) -> List[str]:
+    """Unescapes many texts at once, like :func:`unescape_everything` on each
+
+    The rules are looked up once for all the texts, which is faster for many short texts.
+
+    :param texts: the texts to unescape
+    :param markdown: whether to unescape markdown-like formatting, like :func:`unescape_markdown`
+    :param mentions: whether to unescape mentions, like :func:`unescape_mentions`
+    :param esc_timestamps: whether timestamp formatting was escaped in the texts
+    :param esc_channels: whether channel mentions were escaped in the texts
+    """
+    pattern, triggers = _fused_unescape(markdown, esc_timestamps, mentions, esc_channels)
+    sub = pattern.sub
+    search = triggers.search
+    return [text if search(text) is None else sub(_fused_unsub, text) for text in texts]
+
+
+# code is kept as is, so it comes first
+STRIP_RE = re.compile("|".join((
+    r"(?P<fence>```(?:[A-Za-z0-9_+\-.#]*\n)?(?P<fence_code>[\s\S]*?)```)",
+    r"(?P<code>``(?P<code_double>.+?)``|`(?P<code_single>[^`]+)`)",
+    r"(?P<escape>\\(?P<escaped>[^\w\s]))",
+    r"(?P<link>\[(?P<link_title>(?:\\.|[^\[\]\\\n])*)\]\(<?(?P<link_url>[^\s()<>]*)>?\))",
+    r"(?P<url><(?P<url_text>[a-zA-Z][a-zA-Z0-9+.\-]*://[^\s<>]*)>)",
+    r"(?P<mention>" + UNESCAPE_USER_ROLE_CHANNEL_RE.pattern + ")",
+    r"(?P<eh>(?i:" + UNESCAPE_EVERYONE_HERE_RE.pattern + "))",
+    r"(?P<prefix>^(?:>>>|>|#{1,3}|-#) )",
+    r"(?P<marker>\*\*|\*|__|~~|\|\|)",
+)), flags=re.MULTILINE)
+STRIP_TRIGGERS_RE = re.compile(r"[`\\\[<>#*_~|\-\u200b]")
+# underscores followed by this are part of a name, like in __init__.py
+_NAME_CONTINUES_RE = re.compile(r"\.?\w")
+
+
+def _strip_sub(match: Match) -> str:
+    kind = match.lastgroup
+    if kind == "fence":
+        return match.group("fence_code")
+    if kind == "code":
+        code = match.group("code_double")
+        return match.group("code_single") if code is None else code
+    if kind == "escape":
+        return match.group("escaped")
+    if kind == "link":
+        return strip_markdown(match.group("link_title"))
+    if kind == "url":
+        return match.group("url_text")
+    if kind in ("mention", "eh"):
+        return _fused_unsub(match)
+    # line prefixes
+    return ""
+
+
+def _strip(text: str) -> str:
+    """Strips the text, removing formatting markers only in pairs
+
+    Markers are paired like in :func:`parse_markdown`: closing a marker closes the markers opened after it,
+    which are then kept as text. Each marker is handled at most twice, so stripping is linear.
+    """
+    out: List[str] = []
+    # each open marker as (marker, index of its text in the output)
+    stack: List[Tuple[str, int]] = []
+    open_markers: Dict[str, int] = {}
+    pos = 0
+    for match in STRIP_RE.finditer(text):
+        start = match.start()
+        if start > pos:
+            out.append(text[pos:start])
+        pos = match.end()
+        if match.lastgroup != "marker":
+            out.append(_strip_sub(match))
+            continue
+        marker = match.group()
+        before = text[start - 1] if start else " "
+        after = text[pos] if pos < len(text) else " "
+        # like in Discord, styles do not start or end with whitespace
+        if (open_markers.get(marker) and not before.isspace()
+                and (marker != "__" or _NAME_CONTINUES_RE.match(text, pos) is None)):
+            while True:
+                opened, index = stack.pop()
+                open_markers[opened] -= 1
+                if opened == marker:
+                    break
+            out[index] = ""
+        elif not after.isspace() and (marker != "__" or not (before.isalnum() or before == "_")):
+            stack.append((marker, len(out)))
+            open_markers[marker] = open_markers.get(marker, 0) + 1
+            out.append(marker)
+        else:
+            out.append(marker)
+    if not out:
+        return text
+    if pos < len(text):
+        out.append(text[pos:])
+    return "".join(out)
+
+
+def strip_markdown(text: str) -> str:
+    """Utility function to get the plain text of a message, like for indexing it
+
+    Removes formatting markers, block quote and header prefixes, and the escapes added by
+    :func:`escape_everything`, in a single scan of the text. Code keeps its text as is, without its backticks
+    and language. Masked links are replaced by their title, and URLs lose their angle brackets.
+    Mentions and timestamps are kept.
+
+    Formatting markers are only removed in pairs, which are found like in :func:`parse_markdown`,
+    except that a pair cannot start or end with whitespace, and double underscores in names like
+    ``__init__.py`` are kept. Single underscores are kept, since they are much more common in words
+    than as italics.
+
+    .. code-block:: python
+
+        >>> strip_markdown("> **hey** <@\\u200b1234>, see `this_thing` and [the docs](<https://miaow.io>)")
+        'hey <@1234>, see this_thing and the docs'
+
+    :param text: the text to strip
+    """
+    if STRIP_TRIGGERS_RE.search(text) is None:
+        return text
+    return _strip(text)
+
+
+def strip_markdown_many(texts: Iterable[str]) -> List[str]:
+    """Strips many texts at once, like :func:`strip_markdown` on each
+
+    :param texts: the texts to strip
+    """
+    search = STRIP_TRIGGERS_RE.search
+    return [text if search(text) is None else _strip(text) for text in texts]
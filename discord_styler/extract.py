@@ -0,0 +1,136 @@
+"""
+discord-styled-text - extract.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import re
+from enum import Enum
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .escape import USER_ROLE_CHANNEL_RE, EVERYONE_HERE_RE, TIMESTAMP_RE, PARTIAL_LT_RE, PARTIAL_EVERYONE_HERE_RE
+from .styler import TimeStyle
+
+
+__all__ = [
+    "SpanKind",
+    "Span",
+    "extract_spans",
+    "iter_spans",
+]
+
+
+class SpanKind(Enum):
+    """Kinds of :class:`Span`"""
+    User = "user"
+    NicknameUser = "nickname_user"
+    Role = "role"
+    Channel = "channel"
+    Everyone = "everyone"
+    Here = "here"
+    TimeStamp = "timestamp"
+
+
+class Span(NamedTuple):
+    """A mention or timestamp found in text
+
+    :param kind: What was found
+    :param start: The index of the first character in the text
+    :param end: The index after the last character in the text
+    :param id: The ID for user, role, and channel mentions, or the UNIX timestamp for timestamps
+    :param style: The style of timestamps, if any
+    """
+    kind: SpanKind
+    start: int
+    end: int
+    id: Optional[int] = None
+    style: Optional[TimeStyle] = None
+
+
+# the same rules as the escaping functions, so both always agree on what is a mention or a timestamp
+SPANS_RE = re.compile(f"(?P<mention>{USER_ROLE_CHANNEL_RE.pattern})"
+                      f"|(?P<eh>(?i:{EVERYONE_HERE_RE.pattern}))"
+                      f"|(?P<ts>{TIMESTAMP_RE.pattern})")
+
+_MENTION_KINDS = {"@": SpanKind.User, "@!": SpanKind.NicknameUser, "@&": SpanKind.Role, "#": SpanKind.Channel}
+_TIME_STYLES = {style.value: style for style in TimeStyle}
+
+
+def extract_spans(text: str) -> List[Span]:
+    """Finds all the mentions and timestamps in the text, in a single scan
+
+    Timestamps escaped with a backslash are skipped, like Discord does.
+
+    .. code-block:: python
+
+        >>> extract_spans("hey <@!1234>, see you <t:1618953630:R>")
+        [Span(kind=<SpanKind.NicknameUser: 'nickname_user'>, start=4, end=12, id=1234, style=None),
+         Span(kind=<SpanKind.TimeStamp: 'timestamp'>, start=22, end=38, id=1618953630, style=<TimeStyle.Relative: 'R'>)]
+
+    :param text: the text to search
+    """
+    return list(_spans(text, 0, 0, len(text)))
+
+
+def iter_spans(text: Union[str, Iterable[str]]) -> Iterator[Span]:
+    """Lazily finds all the mentions and timestamps in a text, or in a text split in chunks
+
+    Chunks are scanned as they are read, so large archives can be streamed without being loaded at once.
+    The offsets of the spans are relative to the whole text, even when a span is split between chunks.
+
+    :param text: the text to search, or an iterable of chunks of it
+    """
+    if isinstance(text, str):
+        yield from _spans(text, 0, 0, len(text))
+        return
+    held = ""
+    offset = 0  # offset of the held text in the whole text
+    backslashes = 0  # number of backslashes right before the held text
+    for chunk in text:
+        buffer = held + chunk
+        # the end of the chunk could be the start of a span
+        cut = len(buffer)
+        for start in (buffer.rfind("<"), buffer.rfind("@")):
+            if 0 <= start < cut and (PARTIAL_LT_RE.match(buffer, start)
+                                     or PARTIAL_EVERYONE_HERE_RE.match(buffer, start)):
+                cut = start
+        yield from _spans(buffer, offset, backslashes, cut)
+        backslashes = _backslashes_before(buffer, cut, backslashes)
+        held = buffer[cut:]
+        offset += cut
+    yield from _spans(held, offset, backslashes, len(held))
+
+
+def _spans(text: str, offset: int, backslashes: int, end: int) -> Iterator[Span]:
+    """Finds the spans in the text up to ``end``
+
+    :param offset: the offset of the text in the whole text
+    :param backslashes: the number of backslashes right before the text
+    """
+    for match in SPANS_RE.finditer(text, 0, end):
+        start = match.start()
+        matched = match.group()
+        kind = match.lastgroup
+        if kind == "mention":
+            i = 3 if matched[2] in "!&" else 2
+            yield Span(_MENTION_KINDS[matched[1:i]], offset + start, offset + match.end(), int(matched[i:-1]))
+        elif kind == "eh":
+            yield Span(SpanKind.Everyone if matched[1] in "eE" else SpanKind.Here, offset + start, offset + match.end())
+        else:
+            if _backslashes_before(text, start, backslashes) % 2:
+                continue
+            time, _, style = matched[3:-1].partition(":")
+            yield Span(SpanKind.TimeStamp, offset + start, offset + match.end(), int(time), _TIME_STYLES.get(style))
+
+
+def _backslashes_before(text: str, index: int, backslashes: int) -> int:
+    """Counts the backslashes right before an index of the text
+
+    :param backslashes: the number of backslashes right before the text
+    """
+    i = index
+    while i and text[i - 1] == "\\":
+        i -= 1
+    return index - i + (backslashes if i == 0 else 0)
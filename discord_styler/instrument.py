@@ -0,0 +1,134 @@
+"""
+discord-styled-text - instrument.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, Optional
+
+
+__all__ = [
+    "Stats",
+    "instrumented",
+]
+
+
+class Stats:
+    """Counters of the work done rendering nodes and escaping text
+
+    Rendering is counted for each call rendering a node tree (``str()``, :meth:`MarkupNode.iter_render`,
+    :meth:`MarkupNode.render_to`, and :meth:`Template.render`), by the type of the root node of the tree.
+    The nodes inside the tree are rendered in the same pass, so they are not counted on their own.
+    Leaf nodes stringified on their own and frozen nodes are not counted, since they do not render anything.
+
+    Escaping is counted for each call to the escaping functions, by escaping rule:
+    ``markdown``, ``blockquote``, ``timestamp``, ``everyone_here``, ``mention``, ``header``, ``subtext``,
+    ``list``, and ``link``.
+    Since the rules are applied in a single scan, each rule used scans the whole text.
+
+    All the counters are dictionaries which can be read directly, or exported with :meth:`as_dict`.
+    """
+    def __init__(self) -> None:
+        self.__lock = Lock()
+        #: Number of renders, by type of node
+        self.renders: Dict[str, int] = {}
+        #: Number of characters rendered, by type of node
+        self.rendered_chars: Dict[str, int] = {}
+        #: Cumulative time spent rendering in seconds, by type of node
+        self.render_time: Dict[str, float] = {}
+        #: Number of characters scanned, by escaping rule
+        self.scanned_chars: Dict[str, int] = {}
+        #: Number of substitutions made, by escaping rule
+        self.substitutions: Dict[str, int] = {}
+        #: Cumulative time spent escaping in seconds, by escaping function
+        self.escape_time: Dict[str, float] = {}
+
+    def record_render(self, name: str, chars: int, seconds: float) -> None:
+        """Counts a render of a node tree
+
+        :param name: The name of the type of the node
+        :param chars: The length of the rendered text
+        :param seconds: The time spent rendering
+        """
+        with self.__lock:
+            self.renders[name] = self.renders.get(name, 0) + 1
+            self.rendered_chars[name] = self.rendered_chars.get(name, 0) + chars
+            self.render_time[name] = self.render_time.get(name, 0.0) + seconds
+
+    def record_escape(self, name: str, rules: Dict[str, int], chars: int, seconds: float) -> None:
+        """Counts a call to an escaping function
+
+        :param name: The name of the escaping function
+        :param rules: The number of substitutions made, by rule used
+        :param chars: The length of the text scanned
+        :param seconds: The time spent escaping
+        """
+        with self.__lock:
+            for rule, count in rules.items():
+                self.scanned_chars[rule] = self.scanned_chars.get(rule, 0) + chars
+                self.substitutions[rule] = self.substitutions.get(rule, 0) + count
+            self.escape_time[name] = self.escape_time.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Flattens the counters into a dictionary, to export them to a metrics system
+
+        .. code-block:: python
+
+            >>> with instrumented() as stats:
+            ...     text = str(Bold("Help"))
+            ...
+            >>> stats.as_dict()
+            {'render.Bold.count': 1, 'render.Bold.chars': 8, 'render.Bold.seconds': 1.2e-05}
+        """
+        with self.__lock:
+            flat: Dict[str, float] = {}
+            for prefix, suffix, counters in (("render", "count", self.renders),
+                                             ("render", "chars", self.rendered_chars),
+                                             ("render", "seconds", self.render_time),
+                                             ("escape", "scanned", self.scanned_chars),
+                                             ("escape", "substitutions", self.substitutions),
+                                             ("escape", "seconds", self.escape_time)):
+                for name, value in counters.items():
+                    flat[f"{prefix}.{name}.{suffix}"] = value
+            return flat
+
+    def reset(self) -> None:
+        """Sets all the counters back to zero"""
+        with self.__lock:
+            for counters in (self.renders, self.rendered_chars, self.render_time,
+                             self.scanned_chars, self.substitutions, self.escape_time):
+                counters.clear()
+
+
+# the stats being collected, checked by the hot paths before doing any extra work
+active: Optional[Stats] = None
+
+
+@contextmanager
+def instrumented(stats: Stats = None) -> Iterator[Stats]:
+    """Collects :class:`Stats` about rendering and escaping while in the context
+
+    Instrumentation applies to all threads. When it is off, the only cost is checking that it is.
+
+    .. code-block:: python
+
+        >>> with instrumented() as stats:
+        ...     handle_commands()
+        ...
+        >>> metrics.update(stats.as_dict())
+
+    :param stats: The stats to add to, to keep counting across contexts. New stats are used if absent
+    """
+    global active
+    if stats is None:
+        stats = Stats()
+    previous = active
+    active = stats
+    try:
+        yield stats
+    finally:
+        active = previous
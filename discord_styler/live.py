@@ -0,0 +1,216 @@
+"""
+discord-styled-text - live.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from .styler import MarkupNode, _render
+
+
+__all__ = [
+    "Field",
+    "LiveMessage",
+]
+
+
+class Field(MarkupNode):
+    """Changeable part of a :class:`LiveMessage`
+
+    Renders its value like a :class:`StyledText` with a single object would. Setting a new value marks
+    the field and the nodes containing it as changed in the live messages watching it.
+
+    :param value: The object to render, like a string, a number, or a node
+    """
+    __slots__ = ("_value", "_watchers")
+
+    def __init__(self, value: Any = ""):
+        self._cache = None
+        self._value = value
+        # live messages that are dropped without being closed stop watching on their own
+        self._watchers: "weakref.WeakSet[LiveMessage]" = weakref.WeakSet()
+
+    @property
+    def value(self) -> Any:
+        """The object rendered by the field"""
+        return self._value
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        if value is self._value:
+            return
+        self._value = value
+        self._cache = None
+        for watcher in tuple(self._watchers):
+            watcher._changed(self)
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return "", (self._value,), "", "", False
+
+
+class LiveMessage:
+    """Node tree rendered again and again as its :class:`Field` objects change, like a message being edited
+
+    Every node of the tree keeps its rendered text, like a frozen node. When a field changes, only the field
+    and the nodes containing it are rendered again, reusing the text of everything else.
+    The nodes of the tree must only be changed through fields. Once the message is closed with :meth:`close`,
+    the nodes it froze render normally again.
+
+    .. code-block:: python
+
+        >>> uptime = Field(TimeStamp(1618953630, TimeStyle.Relative))
+        >>> dashboard = LiveMessage(StyledText(Bold("Status"), report, Italic("Up since", uptime), sep="\\n"))
+        >>> text = dashboard.render()
+        >>> uptime.value = TimeStamp(1618957230, TimeStyle.Relative)
+        >>> text = dashboard.render_if_changed()
+        >>> if text is not None:
+        ...     await message.edit(content=text)
+
+    :param root: The node tree of the message
+    """
+    def __init__(self, root: Any):
+        self.__root = root
+        # the nodes containing each node, by id(), with the node itself to keep the id valid
+        self.__parents: Dict[int, Tuple[Any, List[Any]]] = {}
+        self.__fields: List[Field] = []
+        # the nodes frozen by the message, by id(), to unfreeze them when they are no longer part of it
+        self.__frozen: Dict[int, MarkupNode] = {}
+        # nodes whose text must be cached again, deepest first
+        self.__dirty: List[MarkupNode] = []
+        self.__dirty_ids: Set[int] = set()
+        self.__text: Optional[str] = None
+        self.__differs = False
+        self.__index()
+
+    @property
+    def root(self) -> Any:
+        """The node tree of the message"""
+        return self.__root
+
+    @property
+    def changed(self) -> bool:
+        """Whether the text returned by the last :meth:`render` differed from the one before"""
+        return self.__differs
+
+    def render(self) -> str:
+        """Renders the message, reusing the text of the nodes that did not change
+
+        Returns the last text immediately if no field changed since the last render.
+        """
+        if self.__text is not None and not self.__dirty:
+            self.__differs = False
+            return self.__text
+        chain = self.__trailing_nodes()
+        for node in self.__dirty:
+            if node is not self.__root and id(node) not in chain and node._cache is None:
+                node.freeze()
+                self.__frozen[id(node)] = node
+        self.__dirty.clear()
+        self.__dirty_ids.clear()
+        text = _render(self.__root)
+        self.__differs = text != self.__text
+        self.__text = text
+        return text
+
+    def render_if_changed(self) -> Optional[str]:
+        """Renders the message, if its text changed since the last render
+
+        Useful to skip edits that would change nothing.
+
+        :return: the new text, or ``None`` if it is the same
+        """
+        text = self.render()
+        return text if self.__differs else None
+
+    def close(self) -> None:
+        """Stops watching the fields of the message, and unfreezes the nodes frozen by it
+
+        The nodes of the tree can then be used and changed like any other nodes.
+        """
+        self.__unwatch()
+        for node in self.__frozen.values():
+            node._cache = None
+        self.__frozen.clear()
+        self.__dirty.clear()
+        self.__dirty_ids.clear()
+        self.__text = None
+
+    def __unwatch(self) -> None:
+        for field in self.__fields:
+            field._watchers.discard(self)
+        self.__fields.clear()
+
+    def _changed(self, field: Field) -> None:
+        # uncache the field and everything containing it
+        seen: Set[int] = set()
+        stack: List[Any] = [field]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            node._cache = None
+            if id(node) not in self.__dirty_ids:
+                self.__dirty_ids.add(id(node))
+                self.__dirty.append(node)
+            entry = self.__parents.get(id(node))
+            if entry is not None:
+                stack += entry[1]
+        if _has_frame(field._value):
+            # the new value might contain other nodes and fields
+            self.__index()
+
+    def __index(self) -> None:
+        """Finds the parents of every node and the fields of the tree, and marks every node to be cached"""
+        self.__unwatch()
+        self.__parents.clear()
+        order: List[MarkupNode] = []
+        seen: Set[int] = set()
+        stack = [self.__root]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen or not _has_frame(node):
+                continue
+            seen.add(id(node))
+            order.append(node)
+            if isinstance(node, Field):
+                node._watchers.add(self)
+                self.__fields.append(node)
+            for child in node._frame()[1]:
+                if _has_frame(child):
+                    self.__parents.setdefault(id(child), (child, []))[1].append(node)
+                    stack.append(child)
+        # nodes that are no longer part of the message must not keep text that would not be updated
+        for key in [key for key in self.__frozen if key not in seen]:
+            self.__frozen.pop(key)._cache = None
+        # children come after their parents, so the reversed order caches the deepest nodes first
+        order.reverse()
+        self.__dirty = order
+        self.__dirty_ids = seen
+        # stop the next render from returning the last text, even if all the nodes are cached
+        self.__text = None
+
+    def __trailing_nodes(self) -> Set[int]:
+        """Finds the nodes ending the text of the message, which cannot be cached
+
+        They could contain a multi-line block quote, which renders differently when it ends the message.
+        """
+        chain: Set[int] = set()
+        node = self.__root
+        while _has_frame(node):
+            chain.add(id(node))
+            node._cache = None
+            _, children, _, tail, _ = node._frame()
+            if tail or not children:
+                break
+            node = children[-1]
+        return chain
+
+
+def _has_frame(node: Any) -> bool:
+    """Whether the node is made of other objects"""
+    return getattr(type(node), "_frame", MarkupNode._frame) is not MarkupNode._frame
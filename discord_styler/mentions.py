@@ -0,0 +1,87 @@
+"""
+discord-styled-text - mentions.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from time import perf_counter
+from typing import Any, Dict, List, Set, Tuple
+
+from . import instrument
+from .escape import EVERYONE_HERE_RE, escape_mentions
+from .styler import UserMention, RoleMention, _walk, _quote, _NODE
+
+
+__all__ = [
+    "render_with_mentions",
+]
+
+
+# the most IDs Discord accepts in each list of allowed mentions
+_MAX_IDS = 100
+
+
+def render_with_mentions(node: Any, budget: int = None, *, everyone: bool = False,
+                         replied_user: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """Renders a node, and collects the users and roles it mentions into an ``allowed_mentions`` payload
+
+    The mentions are collected from the :class:`UserMention` and :class:`RoleMention` nodes while rendering,
+    so only they can ping. Mentions written directly in strings are left out of the payload, and do not ping.
+    Frozen nodes are walked like other nodes, to find the mentions in them.
+
+    With a budget, only that many different users and roles can be mentioned, in the order of the text.
+    The mentions of any other users and roles are escaped like with :func:`escape_mentions`,
+    so they do not look like pings that failed.
+
+    .. code-block:: python
+
+        >>> text, allowed = render_with_mentions(StyledText(UserMention(1234), RoleMention(5678), "hi"), 1)
+        >>> text
+        '<@1234> <@&\\u200b5678> hi'
+        >>> allowed
+        {'parse': [], 'users': ['1234'], 'roles': [], 'replied_user': False}
+
+    :param node: The node to render
+    :param budget: The most different users and roles that can be mentioned, unlimited if absent.
+        Discord accepts up to 100 users and 100 roles, any more are escaped too
+    :param everyone: Whether ``@everyone`` and ``@here`` in strings can ping
+    :param replied_user: Whether the author of the message replied to can be pinged
+    :return: the rendered text, and the ``allowed_mentions`` payload to send it with
+    """
+    stats = instrument.active
+    start = perf_counter() if stats is not None else 0.0
+    out: List[str] = []
+    append = out.append
+    users: List[str] = []
+    roles: List[str] = []
+    # the users and roles that can be mentioned
+    seen: Set[Tuple[bool, int]] = set()
+    pings_everyone = False
+    for kind, text, depth, leaf in _walk(node, use_cache=False, render_leaves=False):
+        if kind == _NODE:
+            text = str(leaf)
+            if isinstance(leaf, (UserMention, RoleMention)):
+                is_user = isinstance(leaf, UserMention)
+                key = (is_user, leaf._id)
+                if key not in seen:
+                    ids = users if is_user else roles
+                    if (budget is not None and len(seen) >= budget) or len(ids) >= _MAX_IDS:
+                        text = escape_mentions(text)
+                    else:
+                        seen.add(key)
+                        ids.append(str(leaf._id))
+        elif everyone and not pings_everyone and EVERYONE_HERE_RE.search(text) is not None:
+            pings_everyone = True
+        append(_quote(text, depth))
+    rendered = "".join(out)
+    if stats is not None:
+        stats.record_render(type(node).__name__, len(rendered), perf_counter() - start)
+    allowed = {
+        "parse": ["everyone"] if pings_everyone else [],
+        "users": users,
+        "roles": roles,
+        "replied_user": replied_user,
+    }
+    return rendered, allowed
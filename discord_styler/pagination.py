@@ -0,0 +1,178 @@
+"""
+discord-styled-text - pagination.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from typing import Any, Iterator, List, Tuple
+
+from .styler import MESSAGE_LIMIT, _walk, _quote, _TEXT, _ATOM, _HEAD
+
+
+__all__ = [
+    "MESSAGE_LIMIT",
+    "paginate",
+]
+
+
+class _Pages:
+    """State of the page being filled by :func:`paginate`"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.done: List[str] = []
+        self.parts: List[str] = []
+        self.length = 0
+        # whether the page holds more than the markup reopened from the previous page
+        self.content = False
+        # whether the page holds any text besides markup and whitespace
+        self.visible = False
+        # number of pages made so far
+        self.count = 0
+        # open nodes as (quoted head, text closing them at a page break, length reserved for their tail)
+        self.open: List[Tuple[str, str, int]] = []
+        self.closing = 0
+        # number of heads at the end of the page, with nothing after them yet
+        self.pending = 0
+
+    @property
+    def room(self) -> int:
+        return self.limit - self.length - self.closing
+
+    def add(self, text: str, content: bool = True, visible: bool = False) -> None:
+        self.parts.append(text)
+        self.length += len(text)
+        if content:
+            self.content = True
+            self.pending = 0
+        if visible:
+            self.visible = True
+
+    def new_page(self) -> None:
+        # heads with nothing after them are only opened on the next page
+        kept = len(self.open) - self.pending
+        page = "".join(self.parts[:len(self.parts) - self.pending]).rstrip(" \n")
+        # a page with nothing to show is dropped, as Discord rejects empty messages
+        if self.visible:
+            self.done.append(page + "".join(close for _, close, _ in reversed(self.open[:kept])))
+            self.count += 1
+        self.pending = 0
+        reopen = "".join(head for head, _, _ in self.open)
+        self.parts = [reopen]
+        self.length = len(reopen)
+        self.content = False
+        self.visible = False
+        if self.room <= 0:
+            raise ValueError("The limit is too small for the nesting of the styles!")
+
+    def head(self, head: str, tail: str, depth: int) -> None:
+        head = _quote(head, depth)
+        full_tail = _quote(tail, depth)
+        if len(head) + len(full_tail) > self.room and self.content:
+            self.new_page()
+        if len(head) + len(full_tail) > self.room:
+            raise ValueError("The limit is too small for the nesting of the styles!")
+        self.add(head, content=False)
+        self.pending += 1
+        # tails that are only whitespace (like the end of a block quote) are not needed to close a page
+        self.open.append((head, full_tail if tail.strip() else "", len(full_tail)))
+        self.closing += len(full_tail)
+
+    def tail(self, tail: str, depth: int) -> None:
+        self.closing -= self.open.pop()[2]
+        self.add(_quote(tail, depth))
+
+    def atom(self, text: str, depth: int) -> None:
+        quoted = _quote(text, depth)
+        if len(quoted) > self.room and self.content:
+            self.new_page()
+        if len(quoted) <= self.room:
+            self.add(quoted, visible=bool(text.strip()))
+        else:
+            # too big to fit on any page
+            self.text(text, depth)
+
+    def text(self, text: str, depth: int) -> None:
+        while text:
+            quoted = _quote(text, depth)
+            room = self.room
+            if len(quoted) <= room:
+                self.add(quoted, visible=bool(text.strip()))
+                return
+            # the longest start of the text that fits once quoted
+            n = min(len(text), room)
+            if depth:
+                low, high = 0, n
+                while low < high:
+                    mid = (low + high + 1) // 2
+                    if mid + text.count("\n", 0, mid) * 2 * depth <= room:
+                        low = mid
+                    else:
+                        high = mid - 1
+                n = low
+            # break at the last newline, or else the last space, dropping it
+            cut = text.rfind("\n", 0, n + 1)
+            if cut < 0:
+                cut = text.rfind(" ", 0, n + 1)
+            if cut == 0 and not self.content:
+                text = text[1:]
+                continue
+            if cut < 0:
+                if self.content:
+                    self.new_page()
+                    continue
+                # a single word longer than a page
+                self.add(_quote(text[:n], depth), visible=bool(text[:n].strip()))
+                text = text[n:]
+            else:
+                if cut:
+                    self.add(_quote(text[:cut], depth), visible=bool(text[:cut].strip()))
+                # indentation after a newline is kept, but not the rest of a run of spaces
+                text = text[cut + 1:] if text[cut] == "\n" else text[cut + 1:].lstrip(" ")
+            # the next page is only started by what comes after, so that it never holds only markup
+            if text:
+                self.new_page()
+
+    def finish(self) -> None:
+        page = "".join(self.parts)
+        # markup alone is only kept when it is the whole message
+        if self.visible or (not self.count and page.strip()):
+            self.done.append(page)
+
+
+def paginate(node: Any, limit: int = MESSAGE_LIMIT) -> Iterator[str]:
+    """Splits a node into messages that fit within a length limit
+
+    The node is rendered in a single pass. At each page break, all the open styles are closed
+    and then reopened on the next page: code blocks are fenced again with the same language,
+    and block quotes keep quoting their lines. Text is preferably split at newlines, then at spaces,
+    and whitespace at the end of a page is dropped.
+    Mentions, timestamps, and URLs are never split unless they are longer than a page.
+
+    .. code-block:: python
+
+        >>> list(paginate(Bold("a few words"), limit=10))
+        ['**a few**', '**words**']
+
+    :param node: The node (or any other object) to split
+    :param limit: The maximum length of each message, defaults to the Discord message length limit
+    :return: an iterator of messages
+    """
+    if limit < 1:
+        raise ValueError("The limit must be at least 1!")
+    pages = _Pages(limit)
+    for kind, text, depth, extra in _walk(node, use_cache=False):
+        if kind == _TEXT:
+            pages.text(text, depth)
+        elif kind == _ATOM:
+            pages.atom(text, depth)
+        elif kind == _HEAD:
+            pages.head(text, extra, depth)
+        else:
+            pages.tail(text, depth)
+        if pages.done:
+            yield from pages.done
+            pages.done.clear()
+    pages.finish()
+    yield from pages.done
@@ -0,0 +1,191 @@
+"""
+discord-styled-text - parse.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Type
+
+from .styler import (ALLOWED_URL_SCHEMES, StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler,
+                     BlockQuote, CodeBlock, TitledURL, NonEmbeddingURL, UserMention, RoleMention, ChannelMention,
+                     TimeStyle, TimeStamp)
+
+
+__all__ = [
+    "parse_markdown",
+    "iter_parse_markdown",
+]
+
+
+_SCHEMES = "|".join(re.escape(scheme) for scheme in ALLOWED_URL_SCHEMES)
+
+INLINE_TOKEN_RE = re.compile(r"\\[\s\S]|```|`|\*\*|\*|__|~~|\|\||<|\[")
+CODEBLOCK_OPEN_RE = re.compile(r"```([A-Za-z0-9_+\-.#]*)\n")
+# only canonical numbers, so the parsed nodes render back to the same text
+MENTION_RE = re.compile(r"<(@[!&]?|#)(0|[1-9][0-9]*)>")
+TIMESTAMP_RE = re.compile(r"<t:(-?(?:0|[1-9][0-9]*))(?::([" + "".join(style.value for style in TimeStyle) + r"]))?>")
+# only URLs and titles the nodes keep as they are
+NONEMBEDDING_URL_RE = re.compile(r"<((?i:" + _SCHEMES + r")[^\s()<>]*)>")
+TITLED_URL_RE = re.compile(r"\[([^\[\]\n]*)\]\(((?i:" + _SCHEMES + r")[^\s()<>]*)\)")
+
+_STYLES: Dict[str, Type[StyledText]] = {
+    "**": Bold,
+    "*": Italic,
+    "__": Underline,
+    "~~": Strikethrough,
+    "||": Spoiler,
+}
+_MENTIONS = {
+    "@": UserMention,
+    "@&": RoleMention,
+    "#": ChannelMention,
+}
+
+
+def parse_markdown(text: str) -> StyledText:
+    """Parses Discord markdown into nodes
+
+    Parsing is done in linear time, and the nodes render back to exactly the same text.
+    Markup that is not closed, or that the nodes of this library cannot reproduce exactly, is kept as text.
+
+    .. code-block:: python
+
+        >>> node = parse_markdown("**hey** <@1234>, see `this`")
+        >>> str(node)
+        '**hey** <@1234>, see `this`'
+
+    :param text: The markdown to parse
+    :return: a :class:`StyledText` with an empty separator, containing the parsed nodes
+    """
+    children: List[Any] = []
+    plain: List[str] = []
+    quoted: List[str] = []
+    in_fence = False
+    lines = text.split("\n")
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        # only complete lines can be quoted, since block quotes always end with a newline
+        if not in_fence and i != last and line.startswith("> "):
+            if plain:
+                children += _parse_inline("\n".join(plain) + "\n")
+                plain.clear()
+            quoted.append(line[2:])
+        else:
+            if quoted:
+                children.append(BlockQuote(*_parse_inline("\n".join(quoted)), sep=""))
+                quoted.clear()
+            plain.append(line)
+            if line.count("```") % 2:
+                in_fence = not in_fence
+    if plain != [""]:
+        children += _parse_inline("\n".join(plain))
+    return StyledText(*children, sep="")
+
+
+def iter_parse_markdown(messages: Iterable[str]) -> Iterator[StyledText]:
+    """Lazily parses messages one at a time with :func:`parse_markdown`
+
+    :param messages: The markdown of each message
+    """
+    for message in messages:
+        yield parse_markdown(message)
+
+
+def _parse_inline(text: str) -> List[Any]:
+    """Parses the inline markup of the text, without block quotes
+
+    Open styles are kept on a stack. When a style is closed, the styles opened after it were never closed,
+    so their markers become text again. Every marker is handled at most twice, so parsing is linear.
+    """
+    # each frame is [marker, children]
+    stack: List[list] = [[None, []]]
+    open_markers: Dict[str, int] = dict.fromkeys(_STYLES, 0)
+    # once a closing backtick or fence is not found, no later one can be
+    ticks = fences = True
+    pos = 0
+    while True:
+        match = INLINE_TOKEN_RE.search(text, pos)
+        if match is None:
+            break
+        start, token = match.start(), match.group()
+        children = stack[-1][1]
+        if start > pos:
+            children.append(text[pos:start])
+        pos = match.end()
+
+        if token in _STYLES:
+            if not open_markers[token]:
+                stack.append([token, []])
+                open_markers[token] += 1
+                continue
+            while True:
+                marker, inner = stack.pop()
+                open_markers[marker] -= 1
+                if marker == token:
+                    break
+                # not closed, so the marker was just text
+                stack[-1][1].append(marker)
+                stack[-1][1] += inner
+            stack[-1][1].append(_STYLES[token](*inner, sep=""))
+            continue
+
+        node: Any = None
+        if token == "```" and fences:
+            opening = CODEBLOCK_OPEN_RE.match(text, start)
+            if opening is not None:
+                # the code block always renders a newline on each side of the code
+                end = text.find("\n```", opening.end())
+                if end < 0:
+                    fences = False
+                else:
+                    node = CodeBlock(text[opening.end():end], opening.group(1) or None)
+                    pos = end + 4
+        elif token == "`" and ticks:
+            end = text.find("`", pos)
+            if end < 0:
+                ticks = False
+            else:
+                node = InlineCode(text[pos:end])
+                pos = end + 1
+        elif token == "<":
+            node, end = _parse_angled(text, start)
+            if node is not None:
+                pos = end
+        elif token == "[":
+            link = TITLED_URL_RE.match(text, start)
+            if link is not None:
+                node = TitledURL(link.group(1), link.group(2))
+                pos = link.end()
+        children.append(token if node is None else node)
+
+    if pos < len(text):
+        stack[-1][1].append(text[pos:])
+    while len(stack) > 1:
+        marker, inner = stack.pop()
+        stack[-1][1].append(marker)
+        stack[-1][1] += inner
+    return stack[0][1]
+
+
+def _parse_angled(text: str, start: int) -> Tuple[Any, int]:
+    """Parses a mention, timestamp, or non-embedding URL, if there is one at the index
+
+    :return: the node or ``None``, and the index after it
+    """
+    mention = MENTION_RE.match(text, start)
+    if mention is not None:
+        symbol, id = mention.groups()
+        if symbol == "@!":
+            return UserMention(int(id), nickname=True), mention.end()
+        return _MENTIONS[symbol](int(id)), mention.end()
+    timestamp = TIMESTAMP_RE.match(text, start)
+    if timestamp is not None:
+        time, style = timestamp.groups()
+        return TimeStamp(int(time), TimeStyle(style) if style else None), timestamp.end()
+    url = NONEMBEDDING_URL_RE.match(text, start)
+    if url is not None:
+        return NonEmbeddingURL(url.group(1)), url.end()
+    return None, start
@@ -0,0 +1,422 @@
+"""
+discord-styled-text - serialize.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, cast
+
+from .styler import (MarkupNode, StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler, BlockQuote,
+                     CodeBlock, TitledURL, NonEmbeddingURL, LinkList, UserMention, RoleMention, ChannelMention,
+                     TimeStyle, TimeStamp, _render)
+from .table import Table
+
+
+__all__ = [
+    "to_tuple",
+    "from_tuple",
+    "to_bytes",
+    "from_bytes",
+]
+
+
+# deeper subtrees are encoded as their text, to stay well within the recursion limit of pickle
+MAX_DEPTH = 200
+
+# the codes must never change meaning, since encoded nodes can be stored
+_STYLED: Tuple[Type[StyledText], ...] = (StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler)
+_STYLED_CODES: Dict[type, int] = {cls: code for code, cls in enumerate(_STYLED)}
+_BLOCKQUOTE = 7
+_CODEBLOCK = 8
+_TITLED_URL = 9
+_NONEMBEDDING_URL = 10
+_USER = 11
+_ROLE = 12
+_CHANNEL = 13
+_TIMESTAMP = 14
+_LINK_LIST = 15
+# text rendered before encoding, which must not be escaped again
+_RAW = 16
+_TABLE = 17
+
+_TIME_STYLES: Dict[str, TimeStyle] = {style.value: style for style in TimeStyle}
+
+MAGIC = b"DST"
+#: Version of the format of :func:`to_bytes`, increased whenever the format changes
+FORMAT_VERSION = 1
+_STRING = 255
+_END = 254
+# stored as their index, the order must never change
+_TIME_STYLE_TAGS: Tuple[Optional[str], ...] = (None, "t", "T", "d", "D", "f", "F", "R")
+
+
+def to_tuple(node: Any) -> Any:
+    """Encodes a node tree into nested tuples of strings and integers
+
+    The encoded form is much smaller and faster to pickle than the nodes, which makes it cheap to send
+    node trees to other processes. Frozen nodes and arbitrary objects are encoded as their text, which is decoded
+    into a frozen node so it is not escaped again, and nodes of other classes are kept as they are.
+
+    .. code-block:: python
+
+        >>> to_tuple(Bold("Hi", UserMention(1234)))
+        (2, ' ', False, 'Hi', (11, 1234, False))
+
+    :param node: The node (or any other object) to encode
+    :return: the encoded node, to decode with :func:`from_tuple`
+    """
+    return _encode(node, 0, None)
+
+
+def from_tuple(data: Any) -> Any:
+    """Decodes a node tree encoded by :func:`to_tuple`
+
+    :param data: The encoded node
+    :return: a node rendering the same text as the encoded node
+    """
+    if type(data) is not tuple:
+        return data
+    return _DECODERS[data[0]](data)
+
+
+def _encode(node: Any, depth: int, memo: Optional[Dict[int, Any]]) -> Any:
+    """Encodes a node tree into tuples
+
+    :param memo: the encoded nodes by ``id()``, so nodes found more than once in the tree are encoded once
+    """
+    if type(node) is str:
+        return node
+    if memo is None:
+        return _encode_node(node, depth, memo)
+    data = memo.get(id(node))
+    if data is None:
+        data = memo[id(node)] = _encode_node(node, depth, memo)
+    return data
+
+
+def _encode_node(node: Any, depth: int, memo: Optional[Dict[int, Any]]) -> Any:
+    cls = type(node)
+    if not isinstance(node, MarkupNode):
+        return _RAW, str(node)
+    # the root keeps its own structure when its text changes once spliced, like with a ``>>>`` quote
+    if node._cache is not None and (depth or node._cache_root is None):
+        return _RAW, node._cache
+    if depth > MAX_DEPTH:
+        return _RAW, _render(node, False)
+    depth += 1
+    # the classes are matched exactly, since subclasses might render differently
+    code = _STYLED_CODES.get(cls)
+    if code is not None:
+        styled = cast(StyledText, node)
+        return (code, styled._sep, styled._escape, *(_encode(obj, depth, memo) for obj in styled._objs))
+    if cls is BlockQuote:
+        quote = cast(BlockQuote, node)
+        return (_BLOCKQUOTE, quote._sep, quote._escape, quote._multiline,
+                *(_encode(obj, depth, memo) for obj in quote._objs))
+    if cls is CodeBlock:
+        code_block = cast(CodeBlock, node)
+        return _CODEBLOCK, code_block._code, code_block._lang
+    if cls is TitledURL:
+        titled_url = cast(TitledURL, node)
+        return _TITLED_URL, _encode(titled_url._title, depth, memo), titled_url._url
+    if cls is NonEmbeddingURL:
+        return _NONEMBEDDING_URL, cast(NonEmbeddingURL, node)._url
+    if cls is UserMention:
+        user = cast(UserMention, node)
+        # name-mangled, which type checkers do not follow
+        return _USER, user._id, user._UserMention__nickname  # type: ignore
+    if cls is RoleMention:
+        return _ROLE, cast(RoleMention, node)._id
+    if cls is ChannelMention:
+        return _CHANNEL, cast(ChannelMention, node)._id
+    if cls is TimeStamp:
+        timestamp = cast(TimeStamp, node)
+        return _TIMESTAMP, timestamp._time, None if timestamp._style is None else timestamp._style.value
+    if cls is LinkList:
+        links = cast(LinkList, node)
+        return (_LINK_LIST, links._sep, *(_encode(link, depth, memo) for link in links._links))
+    if cls is Table:
+        table = cast(Table, node)
+        # the cells are strings already cleaned up by the table
+        return (_TABLE, table._lang, table._align, table._sep, table._header, *table._rows)
+    return node
+
+
+def _decode_styled(data: tuple) -> StyledText:
+    return _STYLED[data[0]](*map(from_tuple, data[3:]), sep=data[1], escape=data[2])
+
+
+def _decode_raw(text: str) -> StyledText:
+    # frozen, so the text is used as is, like the frozen node or object it was rendered from
+    node = StyledText(text)
+    node._cache = text
+    node._cache_root = None
+    node._cache_newlines = text.count("\n")
+    return node
+
+
+def _decode_link_list(data: tuple) -> LinkList:
+    # the links were validated and rendered when the list was made
+    node = LinkList.__new__(LinkList)
+    node._cache = None
+    node._links = [from_tuple(link) for link in data[2:]]
+    node._sep = data[1]
+    return node
+
+
+_DECODERS: List[Callable[[tuple], Any]] = [_decode_styled] * len(_STYLED) + [
+    lambda data: BlockQuote(*map(from_tuple, data[4:]), sep=data[1], escape=data[2], multiline=data[3]),
+    lambda data: CodeBlock(data[1], data[2]),
+    lambda data: TitledURL(from_tuple(data[1]), data[2]),
+    lambda data: NonEmbeddingURL(data[1]),
+    lambda data: UserMention(data[1], data[2]),
+    lambda data: RoleMention(data[1]),
+    lambda data: ChannelMention(data[1]),
+    lambda data: TimeStamp(data[1], None if data[2] is None else _TIME_STYLES[data[2]]),
+    _decode_link_list,
+    lambda data: _decode_raw(data[1]),
+    lambda data: Table(data[5:], data[4], data[1], align=data[2], sep=data[3]),
+]
+
+
+def to_bytes(node: Any) -> bytes:
+    """Serializes a node tree into a compact, versioned binary format
+
+    Each distinct string and subtree is stored once, and repeated ones refer back to it.
+    IDs and timestamps are stored as variable-length integers, and node types and timestamp styles as
+    one-byte tags. The format does not depend on the Python version, unlike pickle.
+
+    .. code-block:: python
+
+        >>> data = to_bytes(StyledText(Bold("Hi", UserMention(1234)), Bold("Hi", UserMention(1234))))
+        >>> data[:4], len(data)
+        (b'DST\\x01', 28)
+        >>> str(from_bytes(data))
+        '**Hi <@1234>** **Hi <@1234>**'
+
+    :param node: The node (or any other object, stored as its text) to serialize
+    :return: the serialized node, to deserialize with :func:`from_bytes`
+    :raises ValueError: if the tree contains nodes of classes not from this library, like :class:`Slot`
+    """
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    _write_record(_encode(node, 0, {}), out, {}, {})
+    out.append(_END)
+    return bytes(out)
+
+
+def from_bytes(data: bytes) -> Any:
+    """Deserializes a node tree serialized by :func:`to_bytes`
+
+    Subtrees that were stored once are shared by the nodes containing them.
+
+    :param data: The serialized node
+    :return: a node rendering the same text as the serialized node, or a string
+    :raises ValueError: if the data is not in a supported version of the format
+    """
+    if len(data) <= len(MAGIC) or data[:len(MAGIC)] != MAGIC:
+        raise ValueError("The data was not made by to_bytes()")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {data[len(MAGIC)]}, expected {FORMAT_VERSION}")
+    reader = _Reader(data, len(MAGIC) + 1)
+    table: List[Any] = []
+    end = len(data) - 1
+    while reader.pos < end:
+        table.append(reader.record(table))
+    if not table or reader.pos != end or data[end] != _END:
+        raise ValueError("The data is truncated or corrupted")
+    # the root is always written last
+    return table[-1]
+
+
+def _write_uint(value: int, out: bytearray) -> None:
+    """Writes a non-negative integer as a varint"""
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_int(value: int, out: bytearray) -> None:
+    """Writes a signed integer as a zigzag varint"""
+    _write_uint(value * 2 if value >= 0 else -value * 2 - 1, out)
+
+
+def _write_record(data: Any, out: bytearray, refs: Dict[Any, int], ids: Dict[int, int]) -> int:
+    """Writes the records of an encoded node and everything it contains, unless already written
+
+    Children are replaced by the index of their record, so the records are hashed in time proportional
+    to their own size only.
+
+    :param refs: the index of the record of each string, and of each node by its fields
+    :param ids: the index of the record of each encoded node by ``id()``, to skip repeated nodes faster
+    :return: the index of the record of the encoded node
+    """
+    if type(data) is tuple:
+        ref = ids.get(id(data))
+        if ref is None:
+            ref = ids[id(data)] = _write_tuple(data, out, refs, ids)
+        return ref
+    if type(data) is not str:
+        raise ValueError(f"Nodes of type {type(data).__name__} cannot be serialized")
+    ref = refs.get(data)
+    if ref is None:
+        encoded = data.encode("utf-8", "surrogatepass")
+        out.append(_STRING)
+        _write_uint(len(encoded), out)
+        out += encoded
+        ref = refs[data] = len(refs)
+    return ref
+
+
+def _write_tuple(data: tuple, out: bytearray, refs: Dict[Any, int], ids: Dict[int, int]) -> int:
+    code = data[0]
+    if code <= _BLOCKQUOTE or code == _LINK_LIST:
+        fields = 4 if code == _BLOCKQUOTE else 2 if code == _LINK_LIST else 3
+        sep = _write_record(data[1], out, refs, ids)
+        children = tuple(_write_record(child, out, refs, ids) for child in data[fields:])
+        key = (code, sep, *data[2:fields], children)
+    elif code in (_CODEBLOCK, _TITLED_URL, _NONEMBEDDING_URL, _RAW):
+        key = (code, *(_write_record(field, out, refs, ids) for field in data[1:]))
+    elif code == _TABLE:
+        # the header and the rows are tuples of cells, not encoded nodes
+        cells = [None if row is None else tuple(_write_record(cell, out, refs, ids) for cell in row)
+                 for row in data[4:]]
+        key = (code, *(_write_record(field, out, refs, ids) for field in data[1:4]), cells[0], tuple(cells[1:]))
+    else:
+        key = data
+    ref = refs.get(key)
+    if ref is None:
+        _write_node(key, out)
+        ref = refs[key] = len(refs)
+    return ref
+
+
+def _write_node(key: tuple, out: bytearray) -> None:
+    code = key[0]
+    out.append(code)
+    if code <= _BLOCKQUOTE or code == _LINK_LIST:
+        _write_uint(key[1], out)
+        if code == _BLOCKQUOTE:
+            out.append((1 if key[2] else 0) | (2 if key[3] else 0))
+        elif code != _LINK_LIST:
+            out.append(1 if key[2] else 0)
+        _write_uint(len(key[-1]), out)
+        for child in key[-1]:
+            _write_uint(child, out)
+    elif code in (_CODEBLOCK, _TITLED_URL, _NONEMBEDDING_URL, _RAW):
+        for field in key[1:]:
+            _write_uint(field, out)
+    elif code == _TABLE:
+        for field in key[1:4]:
+            _write_uint(field, out)
+        out.append(0 if key[4] is None else 1)
+        rows = key[5] if key[4] is None else (key[4], *key[5])
+        _write_uint(len(key[5]), out)
+        for row in rows:
+            _write_uint(len(row), out)
+            for cell in row:
+                _write_uint(cell, out)
+    elif code == _USER:
+        _write_int(key[1], out)
+        out.append(1 if key[2] else 0)
+    elif code == _TIMESTAMP:
+        _write_int(key[1], out)
+        out.append(_TIME_STYLE_TAGS.index(key[2]))
+    else:
+        _write_int(key[1], out)
+
+
+class _Reader:
+    """Reads the records written by :func:`to_bytes`"""
+    def __init__(self, data: bytes, pos: int):
+        self.data = data
+        self.pos = pos
+
+    def byte(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def uint(self) -> int:
+        data, pos = self.data, self.pos
+        value = data[pos]
+        pos += 1
+        if value >= 0x80:
+            value &= 0x7F
+            shift = 7
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+        self.pos = pos
+        return value
+
+    def int(self) -> int:
+        value = self.uint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+    def record(self, table: List[Any]) -> Any:
+        try:
+            code = self.byte()
+            if code == _STRING:
+                length = self.uint()
+                end = self.pos + length
+                if end > len(self.data):
+                    raise IndexError
+                text = self.data[self.pos:end].decode("utf-8", "surrogatepass")
+                self.pos = end
+                return text
+            if code < _BLOCKQUOTE:
+                sep, escape = self.string(table), bool(self.byte())
+                return _STYLED[code](*self.refs(table), sep=sep, escape=escape)
+            if code == _BLOCKQUOTE:
+                sep, flags = self.string(table), self.byte()
+                return BlockQuote(*self.refs(table), sep=sep, escape=bool(flags & 1), multiline=bool(flags & 2))
+            if code == _CODEBLOCK:
+                return CodeBlock(self.string(table), self.string(table))
+            if code == _TITLED_URL:
+                return TitledURL(table[self.uint()], self.string(table))
+            if code == _NONEMBEDDING_URL:
+                return NonEmbeddingURL(self.string(table))
+            if code == _USER:
+                return UserMention(self.int(), bool(self.byte()))
+            if code == _ROLE:
+                return RoleMention(self.int())
+            if code == _CHANNEL:
+                return ChannelMention(self.int())
+            if code == _TIMESTAMP:
+                time, tag = self.int(), _TIME_STYLE_TAGS[self.byte()]
+                return TimeStamp(time, None if tag is None else _TIME_STYLES[tag])
+            if code == _LINK_LIST:
+                sep = self.string(table)
+                return _decode_link_list((_LINK_LIST, sep, *self.refs(table)))
+            if code == _RAW:
+                return _decode_raw(self.string(table))
+            if code == _TABLE:
+                lang, align, sep = self.string(table), self.string(table), self.string(table)
+                has_header, count = self.byte(), self.uint()
+                header = self.cells(table) if has_header else None
+                rows = [self.cells(table) for _ in range(count)]
+                return Table(rows, header, lang, align=align, sep=sep)
+        except IndexError:
+            raise ValueError("The data is truncated or corrupted") from None
+        raise ValueError(f"Unknown record type {code}")
+
+    def refs(self, table: List[Any]) -> List[Any]:
+        return [table[self.uint()] for _ in range(self.uint())]
+
+    def cells(self, table: List[Any]) -> List[str]:
+        return [self.string(table) for _ in range(self.uint())]
+
+    def string(self, table: List[Any]) -> str:
+        """Reads a reference to a string record, for the fields that must be text"""
+        value = table[self.uint()]
+        if type(value) is not str:
+            raise ValueError("The data is truncated or corrupted")
+        return value
@@ -6,13 +6,25 @@ Released under the terms of the BSD 3-Clause license.
 """
 
 
-from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+import mmap
+import os
+import re
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Union
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter
+from typing import (TYPE_CHECKING, Any, Iterable, Iterator, List, Match, Optional, Pattern, Sequence, TextIO,
+                    Tuple, Type, TypeVar, Union)
+
+from . import instrument
+from .escape import escape_everything
 
 
 __all__ = [
+    "MarkupNode",
     "StyledText",
     "Italic",
     "Bold",
@@ -24,34 +36,495 @@ __all__ = [
     "CodeBlock",
     "TitledURL",
     "NonEmbeddingURL",
+    "LinkList",
     "UserMention",
     "RoleMention",
     "ChannelMention",
     "TimeStyle",
     "TimeStamp",
+    "NodeCache",
+    "interned",
 ]
 
 
 ALLOWED_URL_SCHEMES = ("http://", "https://", "steam://")
+MESSAGE_LIMIT = 2000
+
+
+# ---- Rendering ----
+
+_N = TypeVar("_N", bound="MarkupNode")
+
+
+class MarkupNode:
+    """Base class for the markup nodes of this library
+
+    Leaf nodes implement ``__str__()`` directly. Nodes made of other objects describe their markup with
+    a *frame* instead, which lets the whole tree be rendered in a single iterative pass. The cost of rendering
+    is proportional to the size of the output, regardless of how deeply the nodes are nested.
+
+    Any node can be frozen with :meth:`freeze`, after which its rendered text is computed once and reused,
+    including by the nodes that contain it.
+
+    Nodes use ``__slots__`` to stay compact. Subclasses that do not call ``super().__init__()``
+    are simply not frozen until :meth:`freeze` is called.
+    """
+    __slots__ = ("_cache", "_cache_newlines", "_cache_root")
+    # the text of a frozen node rendered by itself, when it differs from its spliced text
+    _cache_root: Optional[str]
+
+    def __init__(self) -> None:
+        self._cache: Optional[str] = None
+
+    if not TYPE_CHECKING:
+        def __getattr__(self, name: str) -> Any:
+            # only called when the slot was never set, as slots cannot have a class-level default
+            if name == "_cache":
+                return None
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        """Describes the markup of the node
+
+        :return: the text before the children, the children, the separator between them,
+            the text after the children, and whether the children are block-quoted
+        """
+        raise NotImplementedError
+
+    def __str__(self) -> str:
+        cache = self._cache
+        if cache is not None and type(self).__str__ is MarkupNode.__str__:
+            root = self._cache_root
+            return cache if root is None else root
+        return _render(self)
+
+    def iter_render(self) -> Iterator[str]:
+        """Renders the node lazily, one chunk of text at a time
+
+        Joined together, the chunks are exactly ``str(node)``. No chunk is larger than the largest leaf
+        of the tree (after block quoting), so the full text never has to be held in memory at once.
+
+        .. code-block:: python
+
+            >>> list(Bold("Help", Italic("me")).iter_render())
+            ['**', 'Help', ' ', '*', 'me', '*', '**']
+        """
+        if self._cache is not None or type(self).__str__ is not MarkupNode.__str__:
+            yield str(self)
+            return
+        stats = instrument.active
+        if stats is not None:
+            yield from _iter_render_instrumented(self, stats)
+            return
+        for _, text, depth, _ in _walk(self):
+            if text:
+                yield _quote(text, depth)
+
+    def render_to(self, writer: TextIO) -> int:
+        """Writes the rendered text of the node into a text writer, one chunk at a time
+
+        See :meth:`iter_render`.
+
+        :param writer: The text writer, like an open text file or an :class:`io.StringIO`
+        :return: the number of characters written
+        """
+        written = 0
+        write = writer.write
+        for chunk in self.iter_render():
+            write(chunk)
+            written += len(chunk)
+        return written
+
+    def freeze(self: _N) -> _N:
+        """Renders the node once and reuses that text from now on
+
+        The node and the objects it contains must not be modified afterwards.
+        Frozen children are spliced in from their own cached text. As that text can be followed by more text,
+        a multi-line :class:`BlockQuote` at its end only keeps the ``>>>`` form when the frozen node is rendered
+        by itself.
+
+        :return: the node itself, to allow ``node = Bold("Help").freeze()``
+        """
+        if self._cache is None:
+            if type(self).__str__ is not MarkupNode.__str__:
+                text = str(self)
+                root = None
+            else:
+                # the text of frozen nodes can be spliced anywhere, so it cannot end in a ``>>>`` quote
+                text = _render(self, False)
+                root = _render(self) if _trailing_quote(self) is not None else None
+            self._cache_root = root
+            self._cache = text
+            self._cache_newlines = text.count("\n")
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the node has been frozen with :meth:`freeze`"""
+        return self._cache is not None
+
+    def rendered_length(self) -> int:
+        """Computes the length of the rendered text of the node, without rendering it
+
+        The length is added up from the lengths of the children and the fixed length of their markup,
+        using the cached text of frozen nodes and the known length of mentions and timestamps.
+        Useful to check the node against message and embed length limits.
+        """
+        if self._cache is not None:
+            root = self._cache_root
+            return len(self._cache if root is None else root)
+        return _rendered_length(self)
+
+    def _length(self) -> int:
+        """Length of the rendered text of a leaf node"""
+        return len(str(self))
+
+
+# kinds of text produced while walking a node tree
+_TEXT = 0  # strings and arbitrary objects
+_ATOM = 1  # leaf nodes, which must not be split
+_HEAD = 2  # text before the children of a node
+_TAIL = 3  # text after the children of a node
+_NODE = 4  # leaf or frozen nodes, when they are not stringified
+
+
+def _walk(root: Any, use_cache: bool = True, render_leaves: bool = True,
+          multiline: bool = True) -> Iterator[Tuple[int, str, int, Any]]:
+    """Walks a node tree in rendering order using an explicit stack
+
+    Every node with children produces exactly one head and one tail, even when they are empty.
+
+    :param root: the node (or any other object) to walk
+    :param use_cache: whether to use the text of frozen nodes instead of walking their children
+    :param render_leaves: whether to stringify leaf and frozen nodes, instead of producing them as is
+    :param multiline: whether a multi-line block quote ending the text can use the ``>>>`` form
+    :return: an iterator of ``(kind, text, depth, extra)`` tuples, where ``depth`` is the number of enclosing
+        block quotes, and ``extra`` is the text that will close a head, or the node itself for unrendered nodes
+    """
+    depth = 0
+    # each frame is [children, next index, separator, tail, quote]
+    stack: List[list] = []
+    node = root
+    # the root is always expanded, so subclasses can wrap ``super().__str__()``
+    expand = getattr(type(root), "_frame", MarkupNode._frame) is not MarkupNode._frame
+    # the multi-line quote is found by its position, as the same node can also appear earlier in the tree
+    trailing = _trailing_quote(root) if multiline and expand else None
+    while True:
+        if type(node) is str:
+            yield _TEXT, node, depth, ""
+        elif not expand and use_cache and isinstance(node, MarkupNode) and node._cache is not None:
+            if render_leaves:
+                yield _ATOM, node._cache, depth, ""
+            else:
+                yield _NODE, "", depth, node
+        elif not expand and type(node).__str__ is not MarkupNode.__str__:
+            # leaf nodes, arbitrary objects, and subclasses with their own __str__()
+            if not isinstance(node, MarkupNode):
+                yield _TEXT, str(node), depth, ""
+            elif render_leaves:
+                yield _ATOM, str(node), depth, ""
+            else:
+                yield _NODE, "", depth, node
+        else:
+            if len(stack) == trailing and all(frame[1] == len(frame[0]) for frame in stack):
+                head, children, sep, tail, quote = node._multiline_frame()
+            else:
+                head, children, sep, tail, quote = node._frame()
+            yield _HEAD, head, depth, tail
+            if quote:
+                depth += 1
+            stack.append([children, 0, sep, tail, quote])
+        expand = False
+
+        while stack:
+            frame = stack[-1]
+            i = frame[1]
+            if i < len(frame[0]):
+                if i and frame[2]:
+                    yield _TEXT, frame[2], depth, ""
+                frame[1] = i + 1
+                node = frame[0][i]
+                break
+            stack.pop()
+            if frame[4]:
+                depth -= 1
+            yield _TAIL, frame[3], depth, ""
+        else:
+            return
+
+
+def _trailing_quote(root: Any) -> Optional[int]:
+    """Finds the multi-line block quote that ends the rendered text of the root, outside of any other quote
+
+    Only such a quote can use the ``>>>`` form, which quotes everything until the end of the message.
+
+    :return: the number of nodes above the quote, each of which it is the last descendant of,
+        or ``None`` if there is no such quote
+    """
+    if type(root).__str__ is not MarkupNode.__str__:
+        # the text of subclasses wrapping super().__str__() might not end with the quote
+        return None
+    node = root
+    above = 0
+    while True:
+        if isinstance(node, BlockQuote):
+            return above if node._multiline and _has_newline(node) else None
+        if node is not root and (type(node).__str__ is not MarkupNode.__str__ or node._cache is not None):
+            return None
+        _, children, _, tail, _ = node._frame()
+        if tail or not children:
+            return None
+        node = children[-1]
+        above += 1
+        if not isinstance(node, MarkupNode):
+            return None
+
+
+def _has_newline(quote: "BlockQuote") -> bool:
+    """Whether the contents of the block quote contain a newline, which makes the ``>>>`` form shorter"""
+    for kind, text, depth, node in _walk(quote, render_leaves=False, multiline=False):
+        if kind == _NODE:
+            if node._cache is not None:
+                if node._cache_newlines:
+                    return True
+                continue
+            if isinstance(node, (MentionABC, TimeStamp)):
+                continue
+            text = str(node)
+        elif not depth and (kind == _HEAD or kind == _TAIL):
+            # the markup of the quote itself
+            continue
+        if "\n" in text:
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def _quote_prefix(depth: int) -> str:
+    return "\n" + "> " * depth
+
+
+def _quote(text: str, depth: int) -> str:
+    """Prefixes every newline of the text for all the block quotes enclosing it"""
+    if depth and "\n" in text:
+        return text.replace("\n", _quote_prefix(depth))
+    return text
+
+
+def _rendered_length(root: Any) -> int:
+    """Adds up the rendered length of a node tree"""
+    length = 0
+    for kind, text, depth, node in _walk(root, render_leaves=False):
+        if kind == _NODE:
+            if node._cache is not None:
+                length += len(node._cache)
+                if depth:
+                    length += node._cache_newlines * 2 * depth
+                continue
+            if not depth or isinstance(node, (MentionABC, TimeStamp)):
+                length += node._length()
+                continue
+            text = str(node)
+        length += len(text)
+        if depth:
+            length += text.count("\n") * 2 * depth
+    return length
+
+
+# deeper trees are rendered by the walk, which does not use the call stack
+_JOIN_DEPTH = 32
+
+
+class _Fallback(Exception):
+    """Raised by :func:`_join` for trees that must be rendered by :func:`_walk`"""
+
+
+def _join(node: Any, level: int, quoted: bool) -> str:
+    """Renders a shallow node tree by joining the text of the children of each node
+
+    Most trees are small, and this avoids the cost of producing every piece of text separately.
+
+    :raises _Fallback: if the tree is deeper than ``_JOIN_DEPTH``, or contains nested or multi-line block quotes
+    """
+    head, children, sep, tail, quote = node._frame()
+    if quote:
+        if quoted or getattr(node, "_multiline", False):
+            raise _Fallback
+    elif level > _JOIN_DEPTH:
+        raise _Fallback
+    parts: List[str] = []
+    append = parts.append
+    for child in children:
+        if type(child) is str:
+            append(child)
+        elif not isinstance(child, MarkupNode):
+            append(str(child))
+        elif child._cache is not None:
+            append(child._cache)
+        elif type(child).__str__ is not MarkupNode.__str__:
+            append(str(child))
+        else:
+            append(_join(child, level + 1, quoted or quote))
+    text = sep.join(parts)
+    if quote and "\n" in text:
+        text = text.replace("\n", "\n> ")
+    return head + text + tail
+
+
+def _render(root: Any, multiline: bool = True) -> str:
+    """Renders a node tree into a single string
+
+    Shallow trees without nested or multi-line block quotes are rendered by :func:`_join`, and the others
+    by :func:`_walk`. Every newline emitted inside block quotes is prefixed once for all the quotes
+    enclosing it, instead of re-scanning the text at each level.
+    """
+    stats = instrument.active
+    start = perf_counter() if stats is not None else 0.0
+    rendered = None
+    if getattr(type(root), "_frame", MarkupNode._frame) is not MarkupNode._frame:
+        try:
+            rendered = _join(root, 0, False)
+        except _Fallback:
+            pass
+    if rendered is None:
+        out: List[str] = []
+        append = out.append
+        for _, text, depth, _ in _walk(root, multiline=multiline):
+            if depth and "\n" in text:
+                text = text.replace("\n", _quote_prefix(depth))
+            append(text)
+        rendered = "".join(out)
+    if stats is not None:
+        stats.record_render(type(root).__name__, len(rendered), perf_counter() - start)
+    return rendered
+
+
+def _iter_render_instrumented(root: "MarkupNode", stats: "instrument.Stats") -> Iterator[str]:
+    """Same as :meth:`MarkupNode.iter_render`, without counting the time spent using the chunks"""
+    chars = 0
+    seconds = 0.0
+    start = perf_counter()
+    for _, text, depth, _ in _walk(root):
+        if text:
+            text = _quote(text, depth)
+            chars += len(text)
+            seconds += perf_counter() - start
+            yield text
+            start = perf_counter()
+    stats.record_render(type(root).__name__, chars, seconds + perf_counter() - start)
+
+
+class NodeCache:
+    """Bounded cache of frozen nodes
+
+    Interns nodes by their class and constructor arguments, so building the same node again returns
+    the already-frozen instance instead. The least recently used nodes are evicted once ``maxsize`` is reached.
+
+    Arguments must be hashable for the node to be cached. Nested nodes are compared by identity,
+    so they should be interned themselves to be shared.
+
+    :param maxsize: The maximum number of nodes to keep
+    """
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("The maximum size must be at least 1!")
+        self.maxsize = maxsize
+        self.__nodes: "OrderedDict[Any, MarkupNode]" = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, cls: Type[_N], *args: Any, **kwargs: Any) -> _N:
+        """Returns a frozen node built as ``cls(*args, **kwargs)``, reusing a cached one when possible
+
+        :param cls: The node class
+        :param args: Positional arguments of the node
+        :param kwargs: Keyword arguments of the node
+        """
+        try:
+            key = (cls, tuple((type(a), a) for a in args), tuple(sorted((k, type(v), v) for k, v in kwargs.items())))
+            hash(key)
+        except TypeError:
+            return cls(*args, **kwargs).freeze()
+        with self.__lock:
+            node = self.__nodes.get(key)
+            if node is not None:
+                self.__nodes.move_to_end(key)
+                return node  # type: ignore
+        node = cls(*args, **kwargs).freeze()
+        with self.__lock:
+            self.__nodes[key] = node
+            while len(self.__nodes) > self.maxsize:
+                self.__nodes.popitem(last=False)
+        return node
+
+    def clear(self) -> None:
+        """Removes all the cached nodes"""
+        with self.__lock:
+            self.__nodes.clear()
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+
+_node_cache = NodeCache()
+
+
+def interned(cls: Type[_N], *args: Any, **kwargs: Any) -> _N:
+    """Returns a frozen node from the default :class:`NodeCache`
+
+    Useful for headers, footers, and other nodes rebuilt with the same contents over and over.
+
+    .. code-block:: python
+
+        >>> interned(Bold, "Help") is interned(Bold, "Help")
+        True
+
+    :param cls: The node class
+    :param args: Positional arguments of the node
+    :param kwargs: Keyword arguments of the node
+    """
+    return _node_cache.get(cls, *args, **kwargs)
 
 
 # ---- Text Styles ----
 
-class StyledText:
+class StyledText(MarkupNode):
     """Container for styled text
 
     Strignifies and concatenates all given objects to simplify style composition.
     All subclasses follow the same logic while adding their markup.
 
+    With ``escape=True``, the strings among the objects are escaped with :func:`escape_everything`,
+    while nodes (like :class:`Bold`) are kept as they are. The strings are escaped only once,
+    the first time the node is rendered.
+
+    .. code-block:: python
+
+        >>> user_input = "**not bold**"
+        >>> str(Bold("Welcome", user_input, escape=True))
+        '**Welcome \\\\*\\\\*not bold\\\\*\\\\***'
+
     :param objects: Objects to style
     :param sep: The separator to use, defaults to a space
+    :param escape: Whether to escape the strings among the objects, defaults to ``False``
     """
-    def __init__(self, *objects: Any, sep: str = " "):
-        self.__objs = objects
-        self.__sep = sep
+    __slots__ = ("_objs", "_sep", "_escape")
+    _markup = ""
 
-    def __str__(self) -> str:
-        return self.__sep.join(str(x) for x in self.__objs)
+    def __init__(self, *objects: Any, sep: str = " ", escape: bool = False):
+        self._cache = None
+        self._objs = objects
+        self._sep = sep
+        # cleared once the strings are escaped
+        self._escape = escape
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return self._markup, self._children(), self._sep, self._markup, False
+
+    def _children(self) -> Tuple[Any, ...]:
+        if self._escape:
+            self._objs = tuple(escape_everything(obj) if type(obj) is str else obj for obj in self._objs)
+            self._escape = False
+        return self._objs
 
 
 class Italic(StyledText):
@@ -59,8 +532,8 @@ class Italic(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "*" + super().__str__() + "*"
+    __slots__ = ()
+    _markup = "*"
 
 
 class Bold(StyledText):
@@ -68,8 +541,8 @@ class Bold(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "**" + super().__str__() + "**"
+    __slots__ = ()
+    _markup = "**"
 
 
 class Underline(StyledText):
@@ -77,8 +550,8 @@ class Underline(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "__" + super().__str__() + "__"
+    __slots__ = ()
+    _markup = "__"
 
 
 class Strikethrough(StyledText):
@@ -86,8 +559,8 @@ class Strikethrough(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "~~" + super().__str__() + "~~"
+    __slots__ = ()
+    _markup = "~~"
 
 
 class InlineCode(StyledText):
@@ -95,8 +568,8 @@ class InlineCode(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "`" + super().__str__() + "`"
+    __slots__ = ()
+    _markup = "`"
 
 
 class Spoiler(StyledText):
@@ -104,8 +577,8 @@ class Spoiler(StyledText):
 
     Takes the same parameters as :class:`StyledText`.
     """
-    def __str__(self) -> str:
-        return "||" + super().__str__() + "||"
+    __slots__ = ()
+    _markup = "||"
 
 
 class BlockQuote(StyledText):
@@ -114,80 +587,287 @@ class BlockQuote(StyledText):
     All newlines will be appended with a ``>`` and a space.
     The inner text will be prepended with a ``>`` and space and appended with a ``\\n``.
 
-    Takes the same parameters as :class:`StyledText`.
+    With ``multiline=True``, Discord's multi-line form is used instead when it is shorter:
+    the text is prepended with ``>>>`` and a space, and the newlines are left as is.
+    This is only possible when the block quote ends the rendered text, outside of any other block quote,
+    since it quotes everything until the end of the message. The text of a frozen node containing it
+    is spliced into other nodes with the ``>`` form.
+
+    .. code-block:: python
+
+        >>> str(BlockQuote("many\\nlines", multiline=True))
+        '>>> many\\nlines'
+
+    Takes the same parameters as :class:`StyledText`, and:
+
+    :param multiline: Whether to use the multi-line form when possible and shorter, defaults to ``False``
     """
-    def __str__(self) -> str:
+    __slots__ = ("_multiline",)
+
+    def __init__(self, *objects: Any, sep: str = " ", escape: bool = False, multiline: bool = False):
+        super().__init__(*objects, sep=sep, escape=escape)
+        self._multiline = multiline
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
         # the final newline is intended because otherwise the text
         # after the blockquote will still be blockquoted
-        return "> " + super().__str__().replace("\n", "\n> ") + "\n"
+        return "> ", self._children(), self._sep, "\n", True
+
+    def _multiline_frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return ">>> ", self._children(), self._sep, "", False
 
 
 # ---- Code Blocks ----
 
-class CodeBlock:
+_C = TypeVar("_C", bound="CodeBlock")
+
+
+class CodeBlock(MarkupNode):
     """Wraps the given code in a code block, optionally with language highlighting
 
     :param code: The contents of the code block
     :param lang: The language code of the code block, left unspecified in the generated markup if absent
     """
-    def __init__(self, code: str, lang: str = None):
-        self.__code = code
-        self.__lang = lang if lang else ""
+    __slots__ = ("_code", "_lang")
 
-    def __str__(self) -> str:
-        return f"```{self.__lang}\n{self.__code}\n```"
+    def __init__(self, code: str, lang: str = None):
+        self._cache = None
+        self._code = code
+        self._lang = lang if lang else ""
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return "```" + self._lang + "\n", (self._code,), "", "\n```", False
+
+    @classmethod
+    def from_file(cls: Type[_C], source: Union[str, "os.PathLike[str]", bytes, bytearray, memoryview],
+                  lang: str = None, *, limit: int = MESSAGE_LIMIT, head: bool = False,
+                  around: Union[str, bytes, Pattern[bytes]] = None, encoding: str = "utf-8") -> _C:
+        """Makes a code block from an excerpt of a file, or of a buffer of encoded text
+
+        Files are memory-mapped, and only the bytes of the excerpt are decoded, so even very large files
+        can be used. The excerpt is made of whole lines, as many as fit in the length limit,
+        with lines that are too long on their own cut short. Triple backticks in the excerpt are broken up
+        with a zero-width space, so they cannot end the code block early.
+
+        .. code-block:: python
+
+            >>> str(CodeBlock.from_file("bot.log", limit=60))
+            '```\\n[21:04:31] INFO: reconnected\\n[21:04:32] INFO: ready\\n```'
+
+        :param source: The path of the file, or a buffer with its contents
+        :param lang: The language code of the code block, left unspecified in the generated markup if absent
+        :param limit: The maximum length of the rendered code block, defaults to the message length limit
+        :param head: Whether to use the first lines instead of the last ones
+        :param around: The text to find, as a string or bytes matched literally, or a compiled bytes regex.
+            If given, the lines around its first match are used
+        :param encoding: The encoding of the text, which must be ASCII-compatible, like UTF-8
+        :raises ValueError: if the limit is too small for any code, or if ``around`` is not found
+        """
+        budget = limit - len("```" + (lang or "") + "\n\n```")
+        if budget < 1:
+            raise ValueError("The limit is too small to fit any code")
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return cls(_excerpt(memoryview(source), budget, head, around, encoding), lang)
+        with open(source, "rb") as file:
+            if not os.fstat(file.fileno()).st_size:
+                return cls(_excerpt(memoryview(b""), budget, head, around, encoding), lang)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return cls(_excerpt(buffer, budget, head, around, encoding), lang)
+
+
+# no encoding supported by from_file() uses more bytes per character
+_MAX_CHAR_BYTES = 4
+_FENCE_BREAK_RE = re.compile(r"``(?=`)")
+
+
+def _excerpt(buffer: Any, budget: int, head: bool, around: Any, encoding: str) -> str:
+    """Decodes the lines of the buffer that fit in the budget
+
+    Only a window of the buffer around the anchor is copied and decoded: the budget in characters
+    cannot take more bytes than that.
+    """
+    size = len(buffer)
+    span = budget * _MAX_CHAR_BYTES
+    match: Optional[Match[bytes]] = None
+    if around is not None:
+        if isinstance(around, str):
+            around = around.encode(encoding)
+        if isinstance(around, bytes):
+            around = re.escape(around)
+        match = re.search(around, buffer)
+        if match is None:
+            raise ValueError("The pattern was not found")
+        start, end = max(0, match.start() - span), min(size, match.end() + span)
+    elif head:
+        start, end = 0, min(size, span)
+    else:
+        start, end = max(0, size - span), size
+    window = bytes(buffer[start:end])
+    # partial lines at the edges of the window might not even be whole characters
+    first = window.find(b"\n") + 1 if start else 0
+    last = window.rfind(b"\n") if end < size else -1
+    if last < first:
+        last = len(window)
+    if match is not None:
+        # lines too long to fit the window are cut at the match
+        first = min(first, match.start() - start)
+        last = max(last, match.end() - start)
+        anchor = window.count(b"\n", first, match.start() - start)
+        # a newline ending the match does not make the next line part of it
+        anchor_end = window.count(b"\n", first, max(match.start(), match.end() - 1) - start)
+    lines = [_FENCE_BREAK_RE.sub("``\u200b", line)
+             for line in window[first:last].decode(encoding, errors="replace").split("\n")]
+
+    if match is None:
+        # a final newline does not need to be shown
+        while len(lines) > 1 and not lines[-1]:
+            lines.pop()
+        anchor = anchor_end = 0 if head else len(lines) - 1
+    length = sum(len(line) + 1 for line in lines[anchor:anchor_end + 1]) - 1
+    if length > budget:
+        text = "\n".join(lines[anchor:anchor_end + 1])
+        return text[-budget:] if match is None and not head else text[:budget]
+
+    # add whole lines on both sides, as long as they fit
+    lo, hi = anchor, anchor_end
+    grown = True
+    while grown:
+        grown = False
+        if hi + 1 < len(lines) and length + len(lines[hi + 1]) + 1 <= budget:
+            hi += 1
+            length += len(lines[hi]) + 1
+            grown = True
+        if lo > 0 and length + len(lines[lo - 1]) + 1 <= budget:
+            lo -= 1
+            length += len(lines[lo]) + 1
+            grown = True
+    return "\n".join(lines[lo:hi + 1])
 
 
 # ---- URLs ----
 
-class TitledURL:
+# matched instead of lowercasing the URL, which would copy it
+_SCHEME_RE = re.compile("(?i:" + "|".join(re.escape(scheme) for scheme in ALLOWED_URL_SCHEMES) + ")")
+# characters that would end the URL early in the markup, percent-encoded
+_URL_UNSAFE_RE = re.compile(r"[ \t\n\r\f\v()<>]")
+_URL_SAFE = {ord(char): f"%{ord(char):02X}" for char in "()<> \t\n\r\f\v"}
+# brackets that would end the title early, unless they are already escaped
+# brackets, and a final backslash that would escape the closing bracket, after an even run of backslashes
+_TITLE_UNSAFE_RE = re.compile(r"(?<!\\)((?:\\\\)*)([\[\]]|\\\Z)")
+
+
+@lru_cache(maxsize=4096)
+def _checked_url(url: str) -> str:
+    """Validates the scheme of the URL, and encodes the characters that would break its markup
+
+    :raises ValueError: if the scheme is not allowed
+    """
+    # Discord will only render http(s) and steam URLs
+    if _SCHEME_RE.match(url) is None:
+        raise ValueError(f"The URL must start with one of: {', '.join(ALLOWED_URL_SCHEMES)}")
+    if _URL_UNSAFE_RE.search(url) is None:
+        return url
+    return url.translate(_URL_SAFE)
+
+
+def _checked_title(title: Any) -> Any:
+    """Escapes the brackets and final backslash of string titles, which would break their markup"""
+    if type(title) is str and ("[" in title or "]" in title or title.endswith("\\")):
+        return _TITLE_UNSAFE_RE.sub(r"\1\\\2", title)
+    return title
+
+
+class TitledURL(MarkupNode):
     """URL with title
 
     This only works inside embeds.
 
+    Brackets in a string title are escaped, and whitespace, parentheses and angle brackets in the URL
+    are percent-encoded, so they cannot break the markup.
+
     :param title: The text to use as the link title
     :param url: The URL. Must be http or https protocol
     """
+    __slots__ = ("_title", "_url")
+
     def __init__(self, title: Union[str, StyledText], url: str):
-        self.__title = title
-        # Discord will only render http(s) and steam URLs
-        if not url.lower().startswith(ALLOWED_URL_SCHEMES):
-            raise ValueError(f"The URL must start with one of: {', '.join(ALLOWED_URL_SCHEMES)}")
-        self.__url = url
+        self._cache = None
+        self._url = _checked_url(url)
+        self._title = _checked_title(title)
 
-    def __str__(self) -> str:
-        return f"[{self.__title}]({self.__url})"
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return "[", (self._title,), "", "](" + self._url + ")", False
 
 
-class NonEmbeddingURL:
+class NonEmbeddingURL(MarkupNode):
     """Non-embedding URL
 
     URL which Discord will not generate an embed for.
 
+    Whitespace, parentheses and angle brackets in the URL are percent-encoded, so they cannot break the markup.
+
     :param url: The URL. Must be http or https protocol
     """
+    __slots__ = ("_url",)
+
     def __init__(self, url: str):
-        # Discord will only render http(s) and steam URLs
-        if not url.lower().startswith(ALLOWED_URL_SCHEMES):
-            raise ValueError(f"The URL must start with one of: {', '.join(ALLOWED_URL_SCHEMES)}")
-        self.__url = url
+        self._cache = None
+        self._url = _checked_url(url)
 
     def __str__(self) -> str:
-        return "<" + self.__url + ">"
+        return "<" + self._url + ">"
+
+    def _length(self) -> int:
+        return 2 + len(self._url)
+
+
+class LinkList(MarkupNode):
+    """Many titled URLs, validated and rendered together
+
+    Renders the same text as a :class:`StyledText` of :class:`TitledURL`, but links with string titles
+    are rendered once when the list is made, and repeated URLs are only validated once.
+
+    .. code-block:: python
+
+        >>> str(LinkList([("miaowware", "https://miaow.io"), ("[docs]", "https://miaow.io/docs (new)")]))
+        '[miaowware](https://miaow.io)\\n[\\\\[docs\\\\]](https://miaow.io/docs%20%28new%29)'
+
+    :param links: The ``(title, url)`` pairs of the links
+    :param sep: The separator to use between links, defaults to a newline
+    :raises ValueError: if the scheme of any URL is not allowed
+    """
+    __slots__ = ("_links", "_sep")
+
+    def __init__(self, links: Iterable[Tuple[Union[str, StyledText], str]], sep: str = "\n"):
+        self._cache = None
+        self._links = [
+            "[" + _checked_title(title) + "](" + _checked_url(url) + ")" if type(title) is str
+            else TitledURL(title, url)
+            for title, url in links
+        ]
+        self._sep = sep
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return "", self._links, self._sep, "", False
 
 
 # ---- Mentions ----
 
-class MentionABC(ABC):
+class MentionABC(MarkupNode, metaclass=ABCMeta):
     """Abstract base class for mention ID formatters
 
     Cannot be directly instantiated. Subclasses must implement ``__str__()``.
 
+    Mentions used over and over can be shared with :func:`interned`.
+
     :param id: The ID to mention
     """
+    __slots__ = ("_id",)
+
     def __init__(self, id: int):
         if not isinstance(id, int):
             raise ValueError("The ID must be an integer!")
+        self._cache = None
         self._id = id
 
     @abstractmethod
@@ -205,6 +885,8 @@ class UserMention(MentionABC):
     :param nickname: Whether to use the "nickname" format instead.
         Currently, this changes nothing in the client and always renders the nickname if it exists
     """
+    __slots__ = ("__nickname",)
+
     def __init__(self, id: int, nickname: bool = False):
         super().__init__(id)
         self.__nickname = nickname
@@ -212,6 +894,9 @@ class UserMention(MentionABC):
     def __str__(self) -> str:
         return f"<@{'!' if self.__nickname else ''}{self._id}>"
 
+    def _length(self) -> int:
+        return (4 if self.__nickname else 3) + len(str(self._id))
+
 
 class RoleMention(MentionABC):
     """Role mention formatter
@@ -221,9 +906,14 @@ class RoleMention(MentionABC):
 
     :param id: The ID to mention
     """
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f"<@&{self._id}>"
 
+    def _length(self) -> int:
+        return 4 + len(str(self._id))
+
 
 class ChannelMention(MentionABC):
     """Channel mention formatter
@@ -233,9 +923,14 @@ class ChannelMention(MentionABC):
 
     :param id: The ID to mention
     """
+    __slots__ = ()
+
     def __str__(self) -> str:
         return f"<#{self._id}>"
 
+    def _length(self) -> int:
+        return 3 + len(str(self._id))
+
 
 # ---- Time ----
 
@@ -250,7 +945,11 @@ class TimeStyle(Enum):
     Relative = "R"
 
 
-class TimeStamp:
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_SECOND = timedelta(seconds=1)
+
+
+class TimeStamp(MarkupNode):
     """Creates a smart timestamp
 
     Renders on the client according to the selected style and the client's locale and timezone.
@@ -263,17 +962,66 @@ class TimeStamp:
     :param time: The UNIX timestamp (in seconds)
     :param style: The smart timestamp style to use
     """
+    __slots__ = ("_time", "_style")
+
     def __init__(self, time: Union[int, datetime], style: TimeStyle = None):
+        self._cache = None
         if isinstance(time, int):
-            self.__time = datetime.fromtimestamp(time, tz=timezone.utc)
+            # bools and other subclasses of int render as plain numbers
+            self._time = int(time)
         elif isinstance(time, datetime):
-            if time.tzinfo != timezone.utc:
-                self.__time = time.astimezone(timezone.utc)
-            else:
-                self.__time = time
+            self._time = _epoch_seconds(time)
         else:
             raise ValueError("The time must be an int or a datetime object!")
-        self.__style = style
+        self._style = style
 
-    def __str__(self):
-        return f"<t:{self.__time.timestamp():.0f}{':' + self.__style.value if self.__style is not None else ''}>"
+    def __str__(self) -> str:
+        return "<t:" + str(self._time) + _timestamp_suffix(self._style)
+
+    def _length(self) -> int:
+        return (4 if self._style is None else 6) + len(str(self._time))
+
+    @staticmethod
+    def format_many(times: Iterable[int], style: TimeStyle = None) -> List[str]:
+        """Renders many UNIX timestamps with the same style at once
+
+        Faster than creating a :class:`TimeStamp` for each of them.
+
+        .. code-block:: python
+
+            >>> TimeStamp.format_many(array("q", [1618953630, 1618957230]), TimeStyle.ShortTime)
+            ['<t:1618953630:t>', '<t:1618957230:t>']
+
+        :param times: The UNIX timestamps (in seconds), as any iterable of ints, an :class:`array.array`,
+            or a NumPy integer array
+        :param style: The smart timestamp style to use
+        :return: the rendered timestamps, in the same order
+        """
+        # arrays of C integers are converted to ints all at once
+        tolist = getattr(times, "tolist", None)
+        if tolist is not None:
+            times = tolist()
+        elif not isinstance(times, list):
+            times = list(times)
+        if not all(type(time) is int for time in times):
+            if not all(isinstance(time, int) for time in times):
+                raise ValueError("The times must be ints!")
+            times = [int(time) for time in times]
+        suffix = _timestamp_suffix(style)
+        return ["<t:" + string + suffix for string in map(str, times)]
+
+
+def _epoch_seconds(time: datetime) -> int:
+    """Converts a datetime to a UNIX timestamp, rounded to the nearest second with integer arithmetic"""
+    if time.utcoffset() is None:
+        # naive datetimes are in local time
+        time = time.astimezone(timezone.utc)
+    seconds, rest = divmod(time - _EPOCH, _SECOND)
+    if rest * 2 > _SECOND or (rest * 2 == _SECOND and seconds % 2):
+        seconds += 1
+    return seconds
+
+
+@lru_cache(maxsize=None)
+def _timestamp_suffix(style: Optional[TimeStyle]) -> str:
+    return (":" + style.value if style is not None else "") + ">"
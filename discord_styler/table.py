@@ -0,0 +1,197 @@
+"""
+discord-styled-text - table.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import zip_longest
+from typing import Any, Iterable, Iterator, List, NoReturn, Optional, Sequence, Tuple, Union, overload
+
+from .styler import MESSAGE_LIMIT, CodeBlock, _FENCE_BREAK_RE
+
+
+__all__ = [
+    "Table",
+]
+
+
+class Table(CodeBlock):
+    """Monospace table in a code block, with each column padded to its widest cell
+
+    Widths are counted in columns of the monospace font: East Asian wide and fullwidth characters take two,
+    and combining and zero-width characters none. The rows are read from the iterable when the table is made,
+    and the width of each column is computed only once, the first time it is needed.
+    Lines are formatted one at a time while rendering, so :meth:`iter_render` and :meth:`pages`
+    never build the text of the whole table.
+
+    .. code-block:: python
+
+        >>> table = Table([("miaowware", 1200), ("0x5c", 45)], header=("Name", "Score"), align="<>")
+        >>> print(table)
+        ```
+        Name       Score
+        ---------  -----
+        miaowware   1200
+        0x5c          45
+        ```
+
+    :param rows: The rows of the table, each an iterable of cells to stringify.
+        Newlines in cells are replaced with spaces. Missing cells are left empty
+    :param header: The cells of the header, underlined with dashes
+    :param lang: The language code of the code block, left unspecified in the generated markup if absent
+    :param align: The alignment of each column: ``<`` for left, ``>`` for right, and ``^`` for centered.
+        Columns without one are aligned left
+    :param sep: The separator to use between columns, defaults to two spaces
+    :raises ValueError: if an alignment is not ``<``, ``>``, or ``^``
+    """
+    __slots__ = ("_rows", "_header", "_align", "_sep", "_widths")
+
+    def __init__(self, rows: Iterable[Iterable[Any]], header: Iterable[Any] = None, lang: str = None, *,
+                 align: str = "", sep: str = "  "):
+        if align.strip("<>^"):
+            raise ValueError("The alignments must be one of '<', '>', or '^'")
+        # the code is made from the rows when rendering
+        super().__init__("", lang)
+        # read at once, so the table can be pickled and rendered more than once
+        self._rows = [tuple(_cell(obj) for obj in row) for row in rows]
+        self._header = None if header is None else tuple(_cell(obj) for obj in header)
+        self._align = align
+        self._sep = sep
+        self._widths: Optional[Tuple[int, ...]] = None
+
+    @property
+    def widths(self) -> Tuple[int, ...]:
+        """The width of each column, in columns of the monospace font"""
+        if self._widths is None:
+            rows = self._rows if self._header is None else [self._header] + self._rows
+            self._widths = tuple(max(map(_width, column)) for column in zip_longest(*rows, fillvalue=""))
+        return self._widths
+
+    def _frame(self) -> Tuple[str, Sequence[Any], str, str, bool]:
+        return "```" + self._lang + "\n", _Lines(self), "\n", "\n```", False
+
+    @classmethod
+    def from_file(cls, *args: Any, **kwargs: Any) -> NoReturn:
+        """Not supported, since the lines of a table are made from its rows
+
+        :raises ValueError: always
+        """
+        raise ValueError("Tables are made from rows, use CodeBlock.from_file() for excerpts of files")
+
+    def pages(self, limit: int = MESSAGE_LIMIT) -> Iterator[str]:
+        """Splits the table into code blocks under a length limit, repeating the header in each
+
+        Rows are never split. The code blocks are made lazily, one at a time.
+
+        :param limit: The maximum length of each code block, defaults to the message length limit
+        :raises ValueError: if the limit is too small for the header, or for a row with the header
+        """
+        lines = _Lines(self)
+        header = lines.header
+        head = "```" + self._lang + "\n" + "".join(line + "\n" for line in header)
+        tail = "\n```"
+        budget = limit - len(head) - len(tail)
+        if budget < 0:
+            raise ValueError("The limit is too small to fit the header of the table")
+        page: List[str] = []
+        length = -1
+        for i in range(len(header), len(lines)):
+            line = lines[i]
+            if page and length + len(line) + 1 > budget:
+                yield head + "\n".join(page) + tail
+                page.clear()
+                length = -1
+            if length + len(line) + 1 > budget:
+                raise ValueError("The limit is too small to fit a row of the table")
+            page.append(line)
+            length += len(line) + 1
+        if page:
+            yield head + "\n".join(page) + tail
+        elif not self._rows:
+            yield str(self)
+
+
+class _Lines(Sequence[str]):
+    """Lines of a :class:`Table`, formatted when they are accessed"""
+    __slots__ = ("_table", "_widths", "header")
+
+    def __init__(self, table: Table):
+        self._table = table
+        self._widths = table.widths
+        self.header: List[str] = []
+        if table._header is not None:
+            self.header = [self._format(table._header),
+                           table._sep.join("-" * width for width in self._widths)]
+
+    def __len__(self) -> int:
+        return len(self.header) + len(self._table._rows)
+
+    @overload
+    def __getitem__(self, i: int) -> str:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("line index out of range")
+        if i < len(self.header):
+            return self.header[i]
+        return self._format(self._table._rows[i - len(self.header)])
+
+    def _format(self, cells: Tuple[str, ...]) -> str:
+        align = self._table._align
+        parts = []
+        for i, width in enumerate(self._widths):
+            cell = cells[i] if i < len(cells) else ""
+            pad = width - _width(cell)
+            side = align[i] if i < len(align) else "<"
+            if side == ">":
+                parts.append(" " * pad + cell)
+            elif side == "^":
+                parts.append(" " * (pad // 2) + cell + " " * (pad - pad // 2))
+            else:
+                parts.append(cell + " " * pad)
+        # without the padding of the last columns
+        return self._table._sep.join(parts).rstrip(" ")
+
+
+def _cell(obj: Any) -> str:
+    text = str(obj)
+    if "\n" in text:
+        text = text.replace("\n", " ")
+    if "```" in text:
+        text = _FENCE_BREAK_RE.sub("``\u200b", text)
+    return text
+
+
+# characters before this range all take a single column
+_MAYBE_NOT_SINGLE_RE = re.compile("[\u0300-\U0010ffff]")
+
+
+def _width(text: str) -> int:
+    """Width of the text in columns of a monospace font"""
+    if _MAYBE_NOT_SINGLE_RE.search(text) is None:
+        return len(text)
+    return _wide_width(text)
+
+
+@lru_cache(maxsize=4096)
+def _wide_width(text: str) -> int:
+    width = 0
+    for char in text:
+        if unicodedata.combining(char) or unicodedata.category(char) in ("Mn", "Me", "Cf"):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+    return width
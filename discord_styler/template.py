@@ -0,0 +1,131 @@
+"""
+discord-styled-text - template.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+from . import instrument
+from .escape import escape_everything
+from .styler import MarkupNode, _walk, _quote, _checked_title, _HEAD, _TAIL, _NODE
+
+
+__all__ = [
+    "Slot",
+    "Template",
+]
+
+
+class Slot(MarkupNode):
+    """Named placeholder for a value filled in when rendering a :class:`Template`
+
+    Can be used anywhere a string can be used in a node. Renders as ``{name}`` outside of templates.
+
+    :param name: The name of the value
+    :param escape: Whether to escape string values with :func:`escape_everything`.
+        Nodes given as values are never escaped. Brackets in string values used as the title
+        of a :class:`TitledURL` are always escaped, like with titles given directly
+    """
+    __slots__ = ("name", "escape")
+
+    def __init__(self, name: str, escape: bool = False):
+        super().__init__()
+        self.name = name
+        self.escape = escape
+
+    def __str__(self) -> str:
+        return "{" + self.name + "}"
+
+
+class Template:
+    """Node tree compiled into literal text and slots
+
+    The tree is rendered once when the template is created. Rendering the template afterwards
+    only fills in the values of the :class:`Slot` objects and joins the result.
+
+    .. code-block:: python
+
+        >>> template = Template(StyledText(Bold("Welcome"), Slot("user"), InlineCode(Slot("code"))))
+        >>> template.render(user=UserMention(1234), code="abc")
+        '**Welcome** <@1234> `abc`'
+
+    :param node: The node to compile
+    :param name: The name of the template in the instrumentation counters (see :func:`instrumented`)
+    """
+    def __init__(self, node: Any, name: str = None):
+        self.__name = f"Template[{name}]" if name else "Template"
+        self.__parts: List[str] = []
+        # (index in the parts, name, block quote depth, escape, whether it is the title of a link)
+        self.__slots: List[Tuple[int, str, int, bool, bool]] = []
+        literal: List[str] = []
+        # for each open node, whether it is a TitledURL
+        links: List[bool] = []
+        for kind, text, depth, extra in _walk(node, render_leaves=False):
+            if kind == _HEAD:
+                links.append(text == "[" and extra.startswith("]("))
+            elif kind == _TAIL:
+                links.pop()
+            elif kind == _NODE:
+                if isinstance(extra, Slot):
+                    self.__parts.append("".join(literal))
+                    literal.clear()
+                    title = bool(links) and links[-1]
+                    self.__slots.append((len(self.__parts), extra.name, depth, extra.escape, title))
+                    self.__parts.append("")
+                    continue
+                text = extra._cache if extra._cache is not None else str(extra)
+            literal.append(_quote(text, depth))
+        self.__parts.append("".join(literal))
+
+    @property
+    def names(self) -> List[str]:
+        """The names of the slots of the template, in order"""
+        return [name for _, name, _, _, _ in self.__slots]
+
+    def render(self, **values: Any) -> str:
+        """Renders the template with the given slot values
+
+        :param values: The value of each slot, by name
+        """
+        return self.__render(values, {})
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Renders the template once for each set of slot values
+
+        Values that appear in more than one set are only escaped once.
+
+        :param rows: The value of each slot by name, for each message
+        """
+        memo: Dict[Tuple[str, bool, int], str] = {}
+        return [self.__render(values, memo) for values in rows]
+
+    def __render(self, values: Mapping[str, Any], memo: Dict[Tuple[str, bool, int], str]) -> str:
+        stats = instrument.active
+        start = perf_counter() if stats is not None else 0.0
+        parts = self.__parts.copy()
+        for i, name, depth, escape, title in self.__slots:
+            try:
+                value = values[name]
+            except KeyError:
+                raise KeyError(f"No value for the slot {name!r}") from None
+            if title:
+                # brackets could end the title early and inject another link
+                value = _checked_title(escape_everything(value) if escape and type(value) is str else value)
+                escape = False
+            if type(value) is str and (escape or depth):
+                key = (value, escape, depth)
+                text = memo.get(key)
+                if text is None:
+                    text = _quote(escape_everything(value) if escape else value, depth)
+                    memo[key] = text
+            else:
+                text = _quote(value if type(value) is str else str(value), depth)
+            parts[i] = text
+        rendered = "".join(parts)
+        if stats is not None:
+            stats.record_render(self.__name, len(rendered), perf_counter() - start)
+        return rendered
@@ -0,0 +1,70 @@
+"""
+discord-styled-text - test_bulk.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pytest import fixture, raises
+
+from discord_styler import (StyledText, Bold, BlockQuote, UserMention, TimeStamp, TimeStyle, render_many,
+                            render_many_async)
+
+
+@fixture(scope="module")
+def nodes():
+    return [StyledText(Bold("Hi", UserMention(i)), "**not bold**", BlockQuote("a\nb", TimeStamp(i, TimeStyle.Relative)),
+                       i, escape=True) for i in range(1_000)]
+
+
+@fixture(scope="module")
+def process_pool():
+    with ProcessPoolExecutor(2) as pool:
+        yield pool
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_render_many(nodes, process_pool):
+    expected = [str(node) for node in nodes]
+    assert render_many(nodes) == expected
+    assert render_many(iter(nodes), process_pool, chunksize=7) == expected
+    with ThreadPoolExecutor(2) as pool:
+        assert render_many(nodes, pool) == expected
+
+
+def test_render_many_async(nodes, process_pool):
+    expected = [str(node) for node in nodes]
+    assert run(render_many_async(nodes, process_pool, chunksize=7)) == expected
+    assert run(render_many_async(nodes)) == expected
+
+
+def test_render_many_tuples(process_pool):
+    # tuples are only decoded by the pools they were encoded for
+    objects = [(1, "x"), ()]
+    expected = ["(1, 'x')", "()"]
+    with ThreadPoolExecutor(2) as pool:
+        assert render_many(objects, pool) == expected
+        assert run(render_many_async(objects, pool)) == expected
+    assert run(render_many_async(objects)) == expected
+    assert render_many(objects, process_pool) == expected
+
+
+def test_render_many_empty(process_pool):
+    assert render_many([], process_pool) == []
+    assert run(render_many_async([])) == []
+
+
+def test_render_many_chunksize(nodes, process_pool):
+    with raises(ValueError):
+        render_many(nodes, process_pool, chunksize=0)
@@ -6,7 +6,10 @@ Released under the terms of the BSD 3-Clause license.
 """
 
 
-from pytest import param, mark
+import re
+import tracemalloc
+
+from pytest import param, mark, raises
 
 from discord_styler import CodeBlock
 
@@ -26,3 +29,69 @@ CodeBlock_test_cases = [
 def test_CodeBlock(content, lang, expected):
     code = CodeBlock(code=content, lang=lang)
     assert str(code) == expected
+
+
+LOG = "".join(f"line {i}\n" for i in range(1000)).encode()
+
+
+from_file_test_data = [
+    param({}, "line 997\nline 998\nline 999", id="tail"),
+    param({"head": True}, "line 0\nline 1\nline 2\nline 3", id="head"),
+    param({"around": "line 500\n"}, "line 499\nline 500\nline 501", id="around_str"),
+    param({"around": b"line 50"}, "line 49\nline 50\nline 51", id="around_bytes"),
+    param({"around": re.compile(rb"line 7[0-9]{2}")}, "line 699\nline 700\nline 701", id="around_pattern"),
+]
+
+
+@mark.parametrize("kwargs,expected", from_file_test_data)
+def test_from_file(tmp_path, kwargs, expected):
+    path = tmp_path / "bot.log"
+    path.write_bytes(LOG)
+    for source in (path, str(path), LOG, memoryview(LOG), bytearray(LOG)):
+        node = CodeBlock.from_file(source, "log", limit=38, **kwargs)
+        assert str(node) == "```log\n" + expected + "\n```"
+        assert len(str(node)) <= 38
+
+
+def test_from_file_fences():
+    node = CodeBlock.from_file(b"a ``` b\n``````\n`", head=True)
+    assert str(node) == "```\na ``\u200b` b\n``\u200b``\u200b``\n`\n```"
+    assert str(node).count("```") == 2
+
+
+def test_from_file_long_lines():
+    assert str(CodeBlock.from_file(b"x" * 100 + b"yz", limit=11)) == "```\nxyz\n```"
+    assert str(CodeBlock.from_file(b"xy" + b"z" * 100, limit=11, head=True)) == "```\nxyz\n```"
+    # multi-byte characters cut in the middle of the window
+    assert str(CodeBlock.from_file("é\n".encode() * 10_000, limit=20)) == "```\né\né\né\né\né\né\n```"
+
+
+def test_from_file_empty(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_bytes(b"")
+    assert str(CodeBlock.from_file(path)) == "```\n\n```"
+
+
+def test_from_file_errors():
+    with raises(ValueError):
+        CodeBlock.from_file(LOG, "py", limit=10)
+    with raises(ValueError):
+        CodeBlock.from_file(LOG, around="missing")
+    with raises(ValueError):
+        # matched literally, not as a regex
+        CodeBlock.from_file(LOG, around=b"line 7[0-9]")
+
+
+def test_from_file_memory(tmp_path):
+    path = tmp_path / "big.log"
+    with open(path, "wb") as file:
+        for _ in range(100):
+            file.write(LOG * 20)
+    tracemalloc.start()
+    try:
+        node = CodeBlock.from_file(path, around="line 500\n")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert "line 500" in str(node)
+    assert peak < 1_000_000
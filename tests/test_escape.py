@@ -6,9 +6,18 @@ Released under the terms of the BSD 3-Clause license.
 """
 
 
+import random
+import re
+
 from pytest import param, mark
 
-from discord_styler import escape_everything, escape_markdown, escape_mentions
+import discord_styler.styler
+from discord_styler import (escape_everything, escape_markdown, escape_mentions, IncrementalEscaper, StyledText, Bold,
+                            Italic, BlockQuote, UserMention, EscapeProfile, Stats, instrumented, unescape_markdown,
+                            unescape_mentions, unescape_everything, unescape_many, strip_markdown, strip_markdown_many)
+from discord_styler.escape import (_compile, INLINE_MD_RE, INLINE_MD_SUB, BLOCKQUOTE_RE, TIMESTAMP_RE, GENERIC_SUB,
+                                   EVERYONE_HERE_RE, EVERYONE_HERE_SUB, USER_ROLE_CHANNEL_RE, USER_ROLE_RE,
+                                   MENTION_SUB)
 
 
 md_test_data = [
@@ -69,3 +78,231 @@ everything_test_data = [
 def test_escape_everything(text, esc_timestamps, esc_channels, expected):
     escaped = escape_everything(text, esc_timestamps=esc_timestamps, esc_channels=esc_channels)
     assert escaped == expected
+
+
+def sequential_escape_everything(text, esc_timestamps, esc_channels):
+    # the rules applied one after the other, as a reference for the single-scan implementation
+    text = re.sub(INLINE_MD_RE, INLINE_MD_SUB, text)
+    text = re.sub(BLOCKQUOTE_RE, GENERIC_SUB, text)
+    if esc_timestamps:
+        text = re.sub(TIMESTAMP_RE, GENERIC_SUB, text)
+    text = re.sub(EVERYONE_HERE_RE, EVERYONE_HERE_SUB, text)
+    return re.sub(USER_ROLE_CHANNEL_RE if esc_channels else USER_ROLE_RE, MENTION_SUB, text)
+
+
+FUZZ_TOKENS = ["a", " ", "\n", "\\", "*", "_", "~", "|", "`", ">", ">>> ", "> ", "<t:123>", "<t:1:R>", "<@1>",
+               "<@!2>", "<@&3>", "<#4>", "@everyone", "@HeRe", "<", "@", "#", "1", ":", "t"]
+
+
+@mark.parametrize("esc_timestamps", [False, True])
+@mark.parametrize("esc_channels", [False, True])
+def test_escape_everything_fuzz(esc_timestamps, esc_channels):
+    rng = random.Random(1234)
+    for _ in range(2000):
+        text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randrange(20)))
+        expected = sequential_escape_everything(text, esc_timestamps, esc_channels)
+        assert escape_everything(text, esc_timestamps=esc_timestamps, esc_channels=esc_channels) == expected
+
+
+def test_escape_plain_not_copied():
+    text = "".join(["nothing special", " here"])
+    assert escape_everything(text) is text
+    assert escape_markdown(text) is text
+    assert escape_mentions(text) is text
+
+
+@mark.parametrize("markdown,mentions,esc_timestamps,esc_channels", [
+    param(True, True, True, True, id="everything"),
+    param(True, True, False, False, id="no_ts_channel"),
+    param(True, False, True, False, id="markdown"),
+    param(False, True, False, True, id="mentions"),
+])
+def test_IncrementalEscaper_fuzz(markdown, mentions, esc_timestamps, esc_channels):
+    rng = random.Random(4321)
+    escaper = IncrementalEscaper(markdown=markdown, mentions=mentions,
+                                 esc_timestamps=esc_timestamps, esc_channels=esc_channels)
+    for _ in range(1000):
+        text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randrange(30)))
+        if markdown and mentions:
+            expected = escape_everything(text, esc_timestamps=esc_timestamps, esc_channels=esc_channels)
+        elif markdown:
+            expected = escape_markdown(text, esc_timestamps=esc_timestamps)
+        else:
+            expected = escape_mentions(text, esc_channels=esc_channels)
+        cuts = sorted(rng.randrange(len(text) + 1) for _ in range(rng.randrange(6)))
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        assert "".join(escaper.feed(chunk) for chunk in chunks) + escaper.flush() == expected
+
+
+def test_IncrementalEscaper_characters():
+    escaper = IncrementalEscaper()
+    text = "> quote\n\\\\*a* <t:12:R> <@!34> @here\n>>> end"
+    assert "".join(escaper.feed(char) for char in text) + escaper.flush() == escape_everything(text)
+
+
+def test_IncrementalEscaper_holds_little():
+    escaper = IncrementalEscaper()
+    assert escaper.feed("plain text <@12") == "plain text "
+    assert escaper.feed("3> and more") == "<@\u200b123> and more"
+    assert escaper.flush() == ""
+
+
+styled_escape_test_data = [
+    param(Bold("**hi**", Italic("*kept*"), escape=True), "**\\*\\*hi\\*\\* **kept****", id="nodes_kept"),
+    param(StyledText("<@1234>", UserMention(1234), "@here", 42, escape=True),
+          "<@\u200b1234> <@1234> @\u200bhere 42", id="mentions"),
+    param(BlockQuote("> a\n> b", escape=True), "> \\> a\n> \\> b\n", id="blockquote"),
+    param(Bold("**hi**"), "****hi****", id="not_escaped"),
+]
+
+
+@mark.parametrize("node,expected", styled_escape_test_data)
+def test_StyledText_escape(node, expected):
+    assert str(node) == expected
+    assert node.rendered_length() == len(expected)
+
+
+def test_StyledText_escape_once(monkeypatch):
+    calls = []
+
+    def counting(text, **kwargs):
+        calls.append(text)
+        return escape_everything(text, **kwargs)
+
+    monkeypatch.setattr(discord_styler.styler, "escape_everything", counting)
+    inner = Italic("_a_", "b", escape=True)
+    node = StyledText(Bold(inner, "**c**", escape=True), inner, sep="\n")
+    assert str(node) == "***\\_a\\_ b* \\*\\*c\\*\\***\n*\\_a\\_ b*"
+    str(node)
+    assert sorted(calls) == ["**c**", "_a_", "b"]
+
+
+# no already escaped formatting, which escaping leaves as is
+UNESCAPE_FUZZ_TOKENS = [token for token in FUZZ_TOKENS if token != "\\"] + ["\\\\", "\\a", "\\<t:5>"]
+
+
+@mark.parametrize("esc_timestamps", [False, True])
+@mark.parametrize("esc_channels", [False, True])
+def test_unescape_fuzz(esc_timestamps, esc_channels):
+    rng = random.Random(5678)
+    for _ in range(2000):
+        text = "".join(rng.choice(UNESCAPE_FUZZ_TOKENS) for _ in range(rng.randrange(20)))
+        markdown = escape_markdown(text, esc_timestamps=esc_timestamps)
+        assert unescape_markdown(markdown, esc_timestamps=esc_timestamps) == text
+        mentions = escape_mentions(text, esc_channels=esc_channels)
+        assert unescape_mentions(mentions, esc_channels=esc_channels) == text
+        everything = escape_everything(text, esc_timestamps=esc_timestamps, esc_channels=esc_channels)
+        assert unescape_everything(everything, esc_timestamps=esc_timestamps, esc_channels=esc_channels) == text
+
+
+unescape_test_data = [
+    param("\\*a\\* \\\\\\_ \\\\x", "*a* \\\\_ \\\\x", id="markdown"),
+    param("\\> a\n\\>>> b\nc \\> d", "> a\n>>> b\nc \\> d", id="blockquote"),
+    param("\\<t:12:R> \\<t:x>", "<t:12:R> \\<t:x>", id="timestamp"),
+    param("<@\u200b1> <@!\u200b2> <@&\u200b3> <#\u200b4> @\u200bEveryone", "<@1> <@!2> <@&3> <#4> @Everyone",
+          id="mentions"),
+]
+
+
+@mark.parametrize("text,expected", unescape_test_data)
+def test_unescape_everything(text, expected):
+    assert unescape_everything(text) == expected
+
+
+def test_unescape_options():
+    assert unescape_markdown("\\*<@\u200b1>") == "*<@\u200b1>"
+    assert unescape_mentions("\\*<@\u200b1>") == "\\*<@1>"
+    assert unescape_markdown("\\<t:1>", esc_timestamps=False) == "\\<t:1>"
+    assert unescape_mentions("<#\u200b1>", esc_channels=False) == "<#\u200b1>"
+
+
+def test_unescape_many():
+    texts = [escape_everything(text) for text in ("**a**", "plain", "<@1> @here", "> q\n<t:1>")]
+    assert unescape_many(texts) == ["**a**", "plain", "<@1> @here", "> q\n<t:1>"]
+    assert unescape_many(texts, mentions=False) == ["**a**", "plain", "<@\u200b1> @\u200bhere", "> q\n<t:1>"]
+
+
+def test_unescape_plain_not_copied():
+    text = "".join(["nothing special", " here"])
+    assert unescape_everything(text) is text
+    assert unescape_many([text])[0] is text
+    assert strip_markdown(text) is text
+
+
+strip_test_data = [
+    param("**bold** *it* __under__ ~~strike~~ ||spoiler|| snake_case", "bold it under strike spoiler snake_case",
+          id="styles"),
+    param("*not closed", "*not closed", id="not_closed"),
+    param("2 * 3 * 4 = 24", "2 * 3 * 4 = 24", id="spaced_markers"),
+    param("see __init__.py and a__b__c", "see __init__.py and a__b__c", id="names"),
+    param("**a *b** c* __d__.", "a *b c* d.", id="unpaired_inside"),
+    param("> quote\n>>> rest\n# Title\n-# small\n1 > 2", "quote\nrest\nTitle\nsmall\n1 > 2", id="prefixes"),
+    param("see `a **b**` and ``c ` d``", "see a **b** and c ` d", id="inline_code"),
+    param("```py\nx = **1**\n```", "x = **1**\n", id="code_block"),
+    param("[**the** docs](https://miaow.io) <https://miaow.io/x>", "the docs https://miaow.io/x", id="links"),
+    param("<@1234> <t:12:R>", "<@1234> <t:12:R>", id="kept"),
+    param(escape_everything("**hi** <@1> @here\n> q <t:1>"), "**hi** <@1> @here\n> q <t:1>", id="escaped"),
+]
+
+
+@mark.parametrize("text,expected", strip_test_data)
+def test_strip_markdown(text, expected):
+    assert strip_markdown(text) == expected
+
+
+def test_strip_markdown_many():
+    texts = [text for text, _ in (data.values for data in strip_test_data)]
+    assert strip_markdown_many(texts) == [strip_markdown(text) for text in texts]
+
+
+profile_test_data = [
+    param({"headers": True}, "# a\n## b\n### c\n#### d\n#e\n x # f", "\\# a\n\\## b\n\\### c\n#### d\n#e\n x # f",
+          id="headers"),
+    param({"subtext": True}, "-# small\n-#no\n- # list", "\\-# small\n-#no\n- # list", id="subtext"),
+    param({"lists": True}, "- a\n  * b\n10. c\n-b\n1.5 d", "\\- a\n  \\* b\n10\\. c\n-b\n1.5 d", id="lists"),
+    param({"lists": True, "markdown": True}, "* *a*\n  * b", "\\* \\*a\\*\n  \\* b", id="lists_markdown"),
+    param({"links": True}, "[a](https://miaow.io) \\[b](x) \\\\[c](x) [d] (x) [e]",
+          "\\[a](https://miaow.io) \\[b](x) \\\\\\[c](x) [d] (x) [e]", id="links"),
+    param({"everyone": True}, "@everyone <@1>", "@\u200beveryone <@1>", id="everyone"),
+    param({"mentions": True}, "@here <@1> <@&2> <#3>", "@here <@\u200b1> <@&\u200b2> <#3>", id="mentions"),
+    param({"channels": True}, "<@1> <#3>", "<@1> <#\u200b3>", id="channels"),
+    param({}, "**a** <@1> # b", "**a** <@1> # b", id="nothing"),
+]
+
+
+@mark.parametrize("options,text,expected", profile_test_data)
+def test_EscapeProfile(options, text, expected):
+    assert EscapeProfile(**options)(text) == expected
+
+
+@mark.parametrize("esc_timestamps", [False, True])
+@mark.parametrize("esc_channels", [False, True])
+def test_EscapeProfile_agrees(esc_timestamps, esc_channels):
+    profile = EscapeProfile(markdown=True, blockquotes=True, timestamps=esc_timestamps, everyone=True, mentions=True,
+                            channels=esc_channels)
+    rng = random.Random(8765)
+    for _ in range(1000):
+        text = "".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randrange(20)))
+        assert profile(text) == escape_everything(text, esc_timestamps=esc_timestamps, esc_channels=esc_channels)
+
+
+def test_EscapeProfile_compiled_once():
+    _compile.cache_clear()
+    EscapeProfile(markdown=True, lists=True)
+    EscapeProfile(lists=True, markdown=True)
+    EscapeProfile(headers=True)
+    assert _compile.cache_info().misses == 2
+
+
+def test_EscapeProfile_many():
+    profile = EscapeProfile(markdown=True, headers=True)
+    texts = ["# *a*", "plain", "## b"]
+    assert profile.escape_many(texts) == [profile(text) for text in texts]
+    assert profile.escape_many(texts)[1] is texts[1]
+
+
+def test_EscapeProfile_instrumented():
+    with instrumented(Stats()) as stats:
+        EscapeProfile(headers=True, lists=True)("# a\n- b\n- c")
+    assert stats.substitutions == {"header": 1, "list": 2}
+    assert "EscapeProfile" in stats.escape_time
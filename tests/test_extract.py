@@ -0,0 +1,49 @@
+"""
+discord-styled-text - test_extract.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import random
+
+from pytest import param, mark
+
+from discord_styler import TimeStyle, SpanKind, Span, extract_spans, iter_spans, escape_mentions
+
+
+extract_test_data = [
+    param("<@123456>", [Span(SpanKind.User, 0, 9, 123456)], id="user"),
+    param("<@!12345>", [Span(SpanKind.NicknameUser, 0, 9, 12345)], id="nickname"),
+    param("<@&12345>", [Span(SpanKind.Role, 0, 9, 12345)], id="role"),
+    param("<#123456>", [Span(SpanKind.Channel, 0, 9, 123456)], id="channel"),
+    param("@everyone @HERE", [Span(SpanKind.Everyone, 0, 9), Span(SpanKind.Here, 10, 15)], id="everyone_here"),
+    param("at <t:12345:f>", [Span(SpanKind.TimeStamp, 3, 14, 12345, TimeStyle.ShortDateTime)], id="timestamp"),
+    param("<t:12345>", [Span(SpanKind.TimeStamp, 0, 9, 12345)], id="timestamp_no_style"),
+    param("\\<t:12345> \\\\<t:6>", [Span(SpanKind.TimeStamp, 13, 18, 6)], id="escaped_timestamp"),
+    param("<@\u200b123456> @\u200beveryone", [], id="escaped_mentions"),
+    param("plain text", [], id="none"),
+]
+
+
+@mark.parametrize("text,expected", extract_test_data)
+def test_extract_spans(text, expected):
+    assert extract_spans(text) == expected
+    assert list(iter_spans(text)) == expected
+
+
+def test_iter_spans_chunks():
+    rng = random.Random(1234)
+    tokens = ["a", " ", "\\", "<@1>", "<@!22>", "<@&333>", "<#4>", "@everyone", "@here", "<t:5>", "<t:66:R>",
+              "<", "@", "t", ":", "1"]
+    for _ in range(1000):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randrange(30)))
+        cuts = sorted(rng.randrange(len(text) + 1) for _ in range(rng.randrange(6)))
+        chunks = (text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)]))
+        assert list(iter_spans(chunks)) == extract_spans(text)
+
+
+def test_extract_agrees_with_escape():
+    text = "<@1> <@!2> <@&3> <#4> @everyone @here"
+    assert extract_spans(escape_mentions(text)) == []
@@ -0,0 +1,85 @@
+"""
+discord-styled-text - test_frozen.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from pytest import raises
+
+from discord_styler import StyledText, Bold, Italic, BlockQuote, CodeBlock, UserMention, NodeCache, interned
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return str(self.calls)
+
+
+def test_freeze_renders_once():
+    counter = Counter()
+    node = Bold("count", counter).freeze()
+    assert node.frozen
+    assert str(node) == "**count 1**"
+    assert str(node) == "**count 1**"
+    assert str(StyledText(node, node)) == "**count 1** **count 1**"
+    assert counter.calls == 1
+
+
+def test_freeze_splices_children():
+    counter = Counter()
+    child = Italic(counter).freeze()
+    parent = BlockQuote("a\nb", child, sep="\n")
+    assert str(parent) == "> a\n> b\n> *1*\n"
+    assert str(parent) == "> a\n> b\n> *1*\n"
+    assert counter.calls == 1
+
+
+def test_freeze_leaves():
+    assert str(StyledText(UserMention(1234).freeze(), CodeBlock("x", "py").freeze())) == "<@1234> ```py\nx\n```"
+
+
+def test_freeze_overridden_str():
+    class Angled(Bold):
+        def __str__(self) -> str:
+            return "<" + super().__str__() + ">"
+
+    node = Angled("a").freeze()
+    assert str(node) == "<**a**>"
+    assert str(StyledText(node)) == "<**a**>"
+
+
+def test_NodeCache():
+    cache = NodeCache(maxsize=2)
+    first = cache.get(Bold, "a")
+    assert first.frozen
+    assert cache.get(Bold, "a") is first
+    assert cache.get(Italic, "a") is not first
+    cache.get(Bold, "b")
+    assert len(cache) == 2
+    assert cache.get(Bold, "a") is not first  # evicted
+    assert cache.get(Bold, "a", sep=".") is not cache.get(Bold, "a")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_NodeCache_unhashable():
+    cache = NodeCache()
+    node = cache.get(StyledText, ["not", "hashable"])
+    assert node.frozen
+    assert len(cache) == 0
+
+
+def test_NodeCache_size():
+    with raises(ValueError):
+        NodeCache(maxsize=0)
+
+
+def test_interned():
+    assert interned(Bold, "Help") is interned(Bold, "Help")
+    assert str(interned(UserMention, 1234, nickname=True)) == "<@!1234>"
+    assert str(interned(BlockQuote, "a\nb", multiline=True)) == ">>> a\nb"
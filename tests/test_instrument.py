@@ -0,0 +1,69 @@
+"""
+discord-styled-text - test_instrument.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import io
+
+from discord_styler import (StyledText, Bold, Italic, BlockQuote, UserMention, Slot, Template, escape_everything,
+                            escape_markdown, escape_mentions, Stats, instrumented)
+from discord_styler import instrument
+
+
+def test_instrumented_render():
+    node = StyledText(Bold("Help", Italic("me")), UserMention(1))
+    with instrumented() as stats:
+        str(node)
+        str(node)
+        "".join(BlockQuote("a\nb").iter_render())
+        Bold("x").render_to(io.StringIO())
+        str(UserMention(2))
+        Template(Bold(Slot("user")), name="greet").render(user="abc")
+    assert stats.renders == {"StyledText": 2, "BlockQuote": 1, "Bold": 1, "Template[greet]": 1}
+    assert stats.rendered_chars == {"StyledText": 2 * len(str(node)), "BlockQuote": 8, "Bold": 5,
+                                    "Template[greet]": 7}
+    assert set(stats.render_time) == set(stats.renders)
+    assert all(seconds >= 0 for seconds in stats.render_time.values())
+
+
+def test_instrumented_escape():
+    text = "**hi** @everyone <@1> <t:1>\n> no"
+    with instrumented() as stats:
+        escape_everything(text)
+        escape_markdown("plain", esc_timestamps=False)
+    assert stats.substitutions == {"markdown": 4, "blockquote": 1, "timestamp": 1, "everyone_here": 1, "mention": 1}
+    assert stats.scanned_chars == {"markdown": len(text) + 5, "blockquote": len(text) + 5, "timestamp": len(text),
+                                   "everyone_here": len(text), "mention": len(text)}
+    assert set(stats.escape_time) == {"escape_everything", "escape_markdown"}
+
+
+def test_instrumented_nesting():
+    stats = Stats()
+    with instrumented(stats):
+        str(Bold("a"))
+        with instrumented() as inner:
+            str(Bold("b"))
+        str(Bold("c"))
+    assert instrument.active is None
+    with instrumented(stats):
+        str(Bold("d"))
+    str(Bold("e"))
+    assert stats.renders == {"Bold": 3}
+    assert inner.renders == {"Bold": 1}
+
+
+def test_stats_export():
+    with instrumented() as stats:
+        str(Bold("Help"))
+        escape_mentions("@here")
+    exported = stats.as_dict()
+    assert exported["render.Bold.count"] == 1
+    assert exported["render.Bold.chars"] == 8
+    assert exported["escape.everyone_here.substitutions"] == 1
+    assert exported["escape.mention.scanned"] == 5
+    assert "escape.escape_mentions.seconds" in exported
+    stats.reset()
+    assert stats.as_dict() == {}
@@ -0,0 +1,143 @@
+"""
+discord-styled-text - test_live.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import gc
+import weakref
+
+from discord_styler import (StyledText, Bold, Italic, Underline, Spoiler, BlockQuote, UserMention, Field,
+                            LiveMessage)
+
+
+def test_field_render():
+    assert str(Field()) == ""
+    assert str(Field(42)) == "42"
+    assert str(Bold("Hi", Field(UserMention(200102491231092736)))) == "**Hi <@200102491231092736>**"
+
+
+def test_render_after_changes():
+    first = Field("one")
+    second = Field(Bold("two"))
+    root = StyledText(Bold("Head", first), Italic("side"), Underline(second), sep="\n")
+    live = LiveMessage(root)
+    assert live.render() == "**Head one**\n*side*\n__**two**__"
+    first.value = "three"
+    second.value = Spoiler("four")
+    assert live.render() == "**Head three**\n*side*\n__||four||__"
+    assert live.render() == str(root)
+
+
+def test_clean_nodes_reused():
+    field = Field("one")
+    side = Italic("side")
+    root = StyledText(side, Bold(field))
+    live = LiveMessage(root)
+    live.render()
+    cached = side._cache
+    assert cached == "*side*"
+    field.value = "two"
+    assert live.render() == "*side* **two**"
+    assert side._cache is cached
+
+
+def test_changed():
+    field = Field("one")
+    live = LiveMessage(StyledText("value:", field))
+    assert live.render_if_changed() == "value: one"
+    assert live.changed
+    assert live.render_if_changed() is None
+    assert not live.changed
+    field.value = "".join(["o", "ne"])
+    assert live.render_if_changed() is None
+    field.value = "two"
+    assert live.render_if_changed() == "value: two"
+
+
+def test_nested_fields():
+    inner = Field("deep")
+    outer = Field(Bold(inner))
+    live = LiveMessage(StyledText("a", outer))
+    assert live.render() == "a **deep**"
+    inner.value = "deeper"
+    assert live.render() == "a **deeper**"
+    replacement = Field("new")
+    outer.value = Italic(replacement)
+    assert live.render() == "a *new*"
+    replacement.value = "newer"
+    assert live.render() == "a *newer*"
+    # no longer part of the message
+    inner.value = "lost"
+    assert live.render_if_changed() is None
+
+
+def test_shared_field():
+    field = Field("one")
+    first = LiveMessage(Bold(field))
+    second = LiveMessage(Italic("x", field))
+    first.render()
+    second.render()
+    field.value = "two"
+    assert first.render() == "**two**"
+    assert second.render() == "*x two*"
+
+
+def test_multiline_quote():
+    field = Field("a\nb")
+    root = StyledText("hi", BlockQuote("x", field, multiline=True))
+    live = LiveMessage(root)
+    assert live.render() == "hi >>> x a\nb"
+    field.value = "c"
+    assert live.render() == "hi > x c\n" == str(root)
+    field.value = "d\ne"
+    assert live.render() == "hi >>> x d\ne" == str(root)
+
+
+def test_close():
+    field = Field("one")
+    inner = Italic(field)
+    root = StyledText(Bold(inner), "end")
+    live = LiveMessage(root)
+    assert live.render() == "***one*** end"
+    assert inner.frozen
+    live.close()
+    assert not inner.frozen
+    field.value = "two"
+    assert str(root) == "***two*** end"
+    assert live.render() == "***two*** end"
+
+
+def test_close_keeps_own_frozen_nodes():
+    frozen = Bold("x").freeze()
+    live = LiveMessage(StyledText(Italic(frozen), Field("y")))
+    live.render()
+    live.close()
+    assert frozen.frozen
+
+
+def test_replaced_nodes_unfrozen():
+    inner = Field("a")
+    old = Bold(inner)
+    field = Field(old)
+    live = LiveMessage(StyledText(field, "end"))
+    live.render()
+    assert old.frozen
+    field.value = Italic("b")
+    assert live.render() == "*b* end"
+    assert not old.frozen
+    inner.value = "c"
+    assert str(old) == "**c**"
+
+
+def test_watchers_not_kept_alive():
+    field = Field("one")
+    live = LiveMessage(Bold(field))
+    watcher = weakref.ref(live)
+    del live
+    gc.collect()
+    assert watcher() is None
+    assert not field._watchers
+    field.value = "two"
@@ -0,0 +1,79 @@
+"""
+discord-styled-text - test_mentions.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from pytest import param, mark
+
+from discord_styler import (StyledText, Bold, BlockQuote, InlineCode, UserMention, RoleMention, ChannelMention,
+                            TimeStamp, Stats, instrumented, escape_mentions, render_with_mentions)
+
+
+def payload(users=(), roles=(), parse=(), replied_user=False):
+    return {"parse": list(parse), "users": list(users), "roles": list(roles), "replied_user": replied_user}
+
+
+mentions_test_data = [
+    param(StyledText("hi", UserMention(1), RoleMention(2), ChannelMention(3), TimeStamp(4)),
+          payload(users=["1"], roles=["2"]), id="mentions"),
+    param(StyledText(UserMention(1), UserMention(1, nickname=True), RoleMention(1)),
+          payload(users=["1"], roles=["1"]), id="repeated"),
+    param(Bold(UserMention(1), Bold(RoleMention(2)).freeze()).freeze(), payload(users=["1"], roles=["2"]), id="frozen"),
+    param(BlockQuote("a\nb", InlineCode(UserMention(1)), multiline=True), payload(users=["1"]), id="quoted"),
+    param(StyledText("<@1> <@&2> @everyone"), payload(), id="strings"),
+    param(UserMention(1), payload(users=["1"]), id="leaf"),
+]
+
+
+@mark.parametrize("node,expected", mentions_test_data)
+def test_render_with_mentions(node, expected):
+    text, allowed = render_with_mentions(node)
+    assert text == str(node)
+    assert allowed == expected
+
+
+def test_budget():
+    node = StyledText(UserMention(1), RoleMention(2), UserMention(3), UserMention(1), RoleMention(4), UserMention(3))
+    text, allowed = render_with_mentions(node, 2)
+    assert text == "<@1> <@&2> " + escape_mentions("<@3>") + " <@1> " + escape_mentions("<@&4> <@3>")
+    assert allowed == payload(users=["1"], roles=["2"])
+    text, allowed = render_with_mentions(node, 0)
+    assert text == escape_mentions(str(node))
+    assert allowed == payload()
+
+
+def test_budget_quoted():
+    node = BlockQuote(UserMention(1), "\n", UserMention(2, nickname=True), sep="")
+    assert render_with_mentions(node, 1)[0] == "> <@1>\n> <@!\u200b2>\n"
+
+
+@mark.parametrize("text,everyone,parse", [
+    param("@everyone", True, ["everyone"], id="everyone"),
+    param("hey @Here", True, ["everyone"], id="here"),
+    param("@\u200beveryone", True, [], id="escaped"),
+    param("@everyone", False, [], id="not_allowed"),
+])
+def test_everyone(text, everyone, parse):
+    assert render_with_mentions(Bold(text), everyone=everyone)[1]["parse"] == parse
+
+
+def test_replied_user():
+    assert render_with_mentions("hi", replied_user=True)[1] == payload(replied_user=True)
+
+
+def test_id_limit():
+    node = StyledText(*(UserMention(i) for i in range(150)), *(RoleMention(i) for i in range(3)), UserMention(120))
+    text, allowed = render_with_mentions(node)
+    users = [f"<@{i}>" for i in range(100)] + [f"<@\u200b{i}>" for i in range(100, 150)]
+    assert text == " ".join(users + ["<@&0>", "<@&1>", "<@&2>", "<@\u200b120>"])
+    assert allowed["users"] == [str(i) for i in range(100)]
+    assert allowed["roles"] == ["0", "1", "2"]
+
+
+def test_instrumented():
+    with instrumented(Stats()) as stats:
+        render_with_mentions(Bold(UserMention(1)))
+    assert stats.renders == {"Bold": 1}
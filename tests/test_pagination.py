@@ -0,0 +1,89 @@
+"""
+discord-styled-text - test_pagination.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import random
+
+from pytest import param, mark, raises
+
+from discord_styler import (StyledText, Bold, Italic, Spoiler, BlockQuote, CodeBlock, UserMention, TimeStamp,
+                            paginate, MESSAGE_LIMIT)
+
+
+paginate_test_data = [
+    param(Bold("a few words"), 10, ["**a few**", "**words**"], id="bold"),
+    param(StyledText("short"), 10, ["short"], id="fits"),
+    param(CodeBlock("one\ntwo\nthree", "py"), 20, ["```py\none\ntwo\n```", "```py\nthree\n```"], id="codeblock"),
+    param(BlockQuote("one\ntwo\nthree"), 12, ["> one\n> two", "> three\n"], id="blockquote"),
+    param(StyledText("hello", Spoiler(Italic("secret words here"))), 20,
+          ["hello ||*secret*||", "||*words here*||"], id="nested"),
+    param(StyledText("abcdefghij"), 4, ["abcd", "efgh", "ij"], id="long_word"),
+    param(StyledText("abc", UserMention(123456)), 10, ["abc", "<@123456>"], id="atom"),
+    param(StyledText("intro", BlockQuote("quoted"), sep="\n"), 12, ["intro", "> quoted\n"], id="no_empty_style"),
+    param(Bold("aaaa "), 8, ["**aaaa**"], id="no_markup_only_page"),
+    param(CodeBlock("aaaa\n", "py"), 14, ["```py\naaaa\n```"], id="no_empty_codeblock_page"),
+    param(Bold("aaaa   cccc cccc"), 8, ["**aaaa**", "**cccc**", "**cccc**"], id="spaces_dropped"),
+    param(CodeBlock("aaaa\n  bb"), 12, ["```\naaaa\n```", "```\n  bb\n```"], id="indent_kept"),
+]
+
+
+@mark.parametrize("node,limit,expected", paginate_test_data)
+def test_paginate(node, limit, expected):
+    assert list(paginate(node, limit=limit)) == expected
+
+
+def test_paginate_single_page():
+    node = StyledText(Bold("hello"), Italic("world"), TimeStamp(1234))
+    assert list(paginate(node)) == [str(node)]
+
+
+def test_paginate_words():
+    rng = random.Random(1234)
+    words = ["".join(rng.choice("abcdef") for _ in range(rng.randrange(1, 12))) for _ in range(2000)]
+    pages = list(paginate(StyledText(*words), limit=MESSAGE_LIMIT))
+    assert len(pages) > 1
+    assert all(len(page) <= MESSAGE_LIMIT for page in pages)
+    assert " ".join(pages) == " ".join(words)
+
+
+def test_paginate_multiline_quote():
+    lines = [f"line {i}" for i in range(30)]
+    pages = list(paginate(StyledText("intro", BlockQuote(*lines, sep="\n", multiline=True), sep="\n"), limit=60))
+    assert len(pages) > 1
+    assert all(len(page) <= 60 for page in pages)
+    assert pages[0].startswith("intro\n>>> line 0\n")
+    assert all(page.startswith(">>> ") for page in pages[1:])
+    assert "\n".join(page.split(">>> ", 1)[1] for page in pages) == "\n".join(lines)
+
+
+def test_paginate_limit_respected():
+    rng = random.Random(4321)
+    styles = [Bold, Italic, Spoiler, BlockQuote]
+    for _ in range(200):
+        node = StyledText(*("word " * rng.randrange(1, 10) + "\n" for _ in range(5)))
+        for _ in range(rng.randrange(4)):
+            node = rng.choice(styles)(node, CodeBlock("x\n" * rng.randrange(5), "py"))
+        limit = rng.randrange(40, 120)
+        assert all(len(page) <= limit for page in paginate(node, limit=limit))
+
+
+def test_paginate_limit_too_small():
+    with raises(ValueError):
+        list(paginate(Bold(Italic(Spoiler("text"))), limit=8))
+    with raises(ValueError):
+        list(paginate("text", limit=0))
+
+
+def test_paginate_no_empty_pages():
+    assert list(paginate("\n\nlongerword", limit=10)) == ["longerword"]
+    assert list(paginate(StyledText(" "))) == []
+    assert list(paginate(Bold("a", " " * 20, "b"), limit=10)) == ["**a**", "**b**"]
+    rng = random.Random(1234)
+    for _ in range(200):
+        node = Bold("a", *(rng.choice(["a", " ", "\n", "word "]) for _ in range(rng.randrange(20))))
+        for page in paginate(node, limit=rng.randrange(6, 20)):
+            assert page.strip("*\n ")
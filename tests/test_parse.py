@@ -0,0 +1,80 @@
+"""
+discord-styled-text - test_parse.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import random
+
+from pytest import param, mark
+
+from discord_styler import (StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler, BlockQuote,
+                            CodeBlock, TitledURL, NonEmbeddingURL, UserMention, RoleMention, ChannelMention,
+                            TimeStamp, TimeStyle, parse_markdown, iter_parse_markdown)
+
+
+def shape(node):
+    """Describes a parsed tree as nested tuples of class names and text"""
+    if isinstance(node, StyledText):
+        return (type(node).__name__, *(shape(child) for child in node._objs))
+    if isinstance(node, str):
+        return node
+    return type(node).__name__, str(node)
+
+
+parse_test_data = [
+    param("**bold** *italic* __under__ ~~strike~~ ||spoiler||",
+          (("Bold", "bold"), " ", ("Italic", "italic"), " ", ("Underline", "under"), " ",
+           ("Strikethrough", "strike"), " ", ("Spoiler", "spoiler")), id="styles"),
+    param("**a *b* c**", (("Bold", "a ", ("Italic", "b"), " c"),), id="nested"),
+    param("*a **b* c**", (("Italic", "a ", "**", "b"), " c", "**"), id="unclosed_inner"),
+    param("`**code**`", (("InlineCode", "**code**"),), id="inline_code"),
+    param("\\*not italic\\*", ("\\*", "not italic", "\\*"), id="escaped"),
+    param("```py\nprint('hi')\n```", (("CodeBlock", "```py\nprint('hi')\n```"),), id="codeblock"),
+    param("> quoted\n> **lines**\nafter", (("BlockQuote", "quoted\n", ("Bold", "lines")), "after"), id="blockquote"),
+    param("> not a quote", ("> not a quote",), id="unterminated_quote"),
+    param("<@1> <@!2> <@&3> <#4>", (("UserMention", "<@1>"), " ", ("UserMention", "<@!2>"), " ",
+                                    ("RoleMention", "<@&3>"), " ", ("ChannelMention", "<#4>")), id="mentions"),
+    param("<t:123:R> <t:0123>", (("TimeStamp", "<t:123:R>"), " ", "<", "t:0123>"), id="timestamps"),
+    param("[home](https://miaow.io) <https://miaow.io> [x](ftp://no)",
+          (("TitledURL", "[home](https://miaow.io)"), " ", ("NonEmbeddingURL", "<https://miaow.io>"), " ",
+           "[", "x](ftp://no)"), id="urls"),
+]
+
+
+@mark.parametrize("text,expected", parse_test_data)
+def test_parse_markdown(text, expected):
+    node = parse_markdown(text)
+    assert shape(node) == ("StyledText", *expected)
+    assert str(node) == text
+
+
+def test_parse_markdown_round_trip_nodes():
+    node = StyledText(Bold("hello", Italic("world")), BlockQuote("a\nb", Spoiler("c")), CodeBlock("x = 1", "py"),
+                      TitledURL("title", "https://miaow.io"), NonEmbeddingURL("https://miaow.io"),
+                      UserMention(1, nickname=True), RoleMention(2), ChannelMention(3),
+                      TimeStamp(4, TimeStyle.LongDate), Underline(Strikethrough("u")), InlineCode("i"), sep="\n")
+    text = str(node)
+    assert str(parse_markdown(text)) == text
+    assert str(parse_markdown(str(parse_markdown(text)))) == text
+
+
+def test_parse_markdown_round_trip_fuzz():
+    rng = random.Random(1234)
+    tokens = ["a", " ", "\n", "\\", "*", "**", "_", "__", "~~", "||", "`", "```", "```py\n", "\n```", "> ", ">",
+              "<@1>", "<@!02>", "<t:5:R>", "<https://x>", "[t](https://y)", "[", "]", "(", ")", "<", "@", "https://"]
+    for _ in range(3000):
+        text = "".join(rng.choice(tokens) for _ in range(rng.randrange(40)))
+        assert str(parse_markdown(text)) == text
+
+
+def test_parse_markdown_linear():
+    text = "~~" + "**" * 20_000 + "`" * 20_000 + "*" * 20_001
+    assert str(parse_markdown(text)) == text
+
+
+def test_iter_parse_markdown():
+    messages = (f"**{i}**" for i in range(3))
+    assert [str(node) for node in iter_parse_markdown(messages)] == ["**0**", "**1**", "**2**"]
@@ -0,0 +1,213 @@
+"""
+discord-styled-text - test_render.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import io
+import pickle
+import random
+
+from pytest import param, mark
+
+from discord_styler import (StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler, BlockQuote,
+                            CodeBlock, TitledURL, NonEmbeddingURL, UserMention, RoleMention, ChannelMention,
+                            TimeStamp, TimeStyle, MentionABC, paginate)
+
+
+nested_test_data = [
+    param(StyledText("a", Bold("b\nc", Italic("d")), BlockQuote("x\ny", BlockQuote("p\nq", sep="\n"), "z"), sep="\n"),
+          "a\n**b\nc *d***\n> x\n> y > p\n> > q\n>  z\n", id="nested_quotes"),
+    param(BlockQuote(CodeBlock("l1\nl2", "py"), TitledURL(Bold("t\nt"), "https://x"), NonEmbeddingURL("https://y")),
+          "> ```py\n> l1\n> l2\n> ``` [**t\n> t**](https://x) <https://y>\n", id="quoted_leaves"),
+    param(Spoiler(InlineCode("c"), Strikethrough(Underline("u")), UserMention(5, True), RoleMention(6),
+                  ChannelMention(7), TimeStamp(9, TimeStyle.Relative)),
+          "||`c` ~~__u__~~ <@!5> <@&6> <#7> <t:9:R>||", id="mixed"),
+    param(BlockQuote(BlockQuote(BlockQuote("a\nb"))), "> > > a\n> > > b\n> > \n> \n", id="triple_quote"),
+    param(StyledText(1, 2.5, None, sep="\n\n"), "1\n\n2.5\n\nNone", id="arbitrary_objects"),
+    param(BlockQuote(), "> \n", id="empty_quote"),
+]
+
+
+@mark.parametrize("node,expected", nested_test_data)
+def test_render_nested(node, expected):
+    assert str(node) == expected
+
+
+def test_render_deep():
+    depth = 50_000
+    node = StyledText("x")
+    for _ in range(depth):
+        node = Bold(node)
+    assert str(node) == "**" * depth + "x" + "**" * depth
+
+
+def test_render_deep_quotes():
+    depth = 5_000
+    node = StyledText("a\nb")
+    for _ in range(depth):
+        node = BlockQuote(node)
+    rendered = str(node)
+    assert rendered.startswith("> " * depth + "a\n" + "> " * depth + "b\n")
+    assert rendered.count("\n") == depth + 1
+
+
+@mark.parametrize("depth", [1, 30, 40])
+def test_render_shallow_same_as_streamed(depth):
+    # shallow trees are joined directly, deeper ones walked, and both must agree with iter_render()
+    node = StyledText("a\nb", BlockQuote("q\nr", Italic("s").freeze()), UserMention(1), sep="\n")
+    for i in range(depth):
+        node = (Bold if i % 2 else BlockQuote)(node, "t", CodeBlock("c"))
+    assert str(node) == "".join(node.iter_render())
+
+
+def test_render_overridden_str():
+    class Angled(Bold):
+        def __str__(self) -> str:
+            return "<" + super().__str__() + ">"
+
+    assert str(StyledText(Angled("a"), Angled("b"))) == "<**a**> <**b**>"
+
+
+def test_render_subclass_without_super_init():
+    class Emoji(MentionABC):
+        def __init__(self, name, id):
+            self.name = name
+            self._id = id
+
+        def __str__(self) -> str:
+            return f"<:{self.name}:{self._id}>"
+
+    class Shout(StyledText):
+        def __init__(self, *objects):
+            self._objs = objects
+            self._sep = "! "
+            self._escape = False
+
+    node = StyledText("hi", Emoji("cat", 1), Bold(Shout("a", "b")))
+    expected = "hi <:cat:1> **a! b**"
+    assert str(node) == expected
+    assert node.rendered_length() == len(expected)
+    assert "".join(node.iter_render()) == expected
+    assert list(paginate(node)) == [expected]
+    shout = Shout("c", "d")
+    assert not shout.frozen
+    assert str(shout.freeze()) == "c! d"
+    assert shout.frozen
+
+
+@mark.parametrize("node,expected", nested_test_data)
+def test_rendered_length(node, expected):
+    assert node.rendered_length() == len(expected)
+
+
+def test_rendered_length_frozen():
+    child = BlockQuote("a\nb", CodeBlock("c\nd")).freeze()
+    node = BlockQuote(StyledText("x", child, sep="\n"), UserMention(1, nickname=True), TimeStamp(1, TimeStyle.LongDate))
+    assert child.rendered_length() == len(str(child))
+    assert node.rendered_length() == len(str(node))
+
+
+def test_rendered_length_fuzz():
+    rng = random.Random(1234)
+    styles = [StyledText, Bold, Italic, Spoiler, BlockQuote, InlineCode]
+    leaves = ["a", "b\nc", "\n", UserMention(12), RoleMention(345), ChannelMention(6789),
+              TimeStamp(123456), TimeStamp(1, TimeStyle.Relative), NonEmbeddingURL("https://miaow.io"), 42]
+    for _ in range(500):
+        nodes = [rng.choice(leaves) for _ in range(6)]
+        for _ in range(10):
+            i = rng.randrange(len(nodes))
+            nodes[i] = rng.choice(styles)(*rng.sample(nodes, rng.randrange(3)), sep=rng.choice([" ", "\n"]))
+            if rng.random() < 0.2:
+                nodes[i] = CodeBlock(str(nodes[i]), "py").freeze()
+        node = StyledText(*nodes)
+        assert node.rendered_length() == len(str(node))
+
+
+@mark.parametrize("node,expected", nested_test_data)
+def test_iter_render(node, expected):
+    chunks = list(node.iter_render())
+    assert "".join(chunks) == expected
+    assert all(chunks)
+    writer = io.StringIO()
+    assert node.render_to(writer) == len(expected)
+    assert writer.getvalue() == expected
+
+
+def test_iter_render_chunks():
+    code = "x\n" * 1_000
+    node = BlockQuote(Bold("a"), CodeBlock(code), CodeBlock(code).freeze())
+    chunks = list(node.iter_render())
+    assert "".join(chunks) == str(node)
+    assert max(len(chunk) for chunk in chunks) == len(str(CodeBlock(code)).replace("\n", "\n> "))
+
+
+def test_iter_render_leaves():
+    class Angled(Bold):
+        def __str__(self) -> str:
+            return "<" + super().__str__() + ">"
+
+    for node in (UserMention(1), TimeStamp(2, TimeStyle.Relative), Angled("b"), Bold("c").freeze()):
+        assert list(node.iter_render()) == [str(node)]
+
+
+multiline_test_data = [
+    param(BlockQuote("many\nlines", multiline=True), ">>> many\nlines", id="root"),
+    param(BlockQuote("one line", multiline=True), "> one line\n", id="longer"),
+    param(StyledText("intro\n", BlockQuote("a\nb", Bold("c"), multiline=True), sep=""), "intro\n>>> a\nb **c**",
+          id="trailing"),
+    param(StyledText(BlockQuote("a\nb", multiline=True), "after"), "> a\n> b\n after", id="not_trailing"),
+    param(Bold(BlockQuote("a\nb", multiline=True)), "**> a\n> b\n**", id="closed_after"),
+    param(BlockQuote("x\n", BlockQuote("a\nb", multiline=True)), "> x\n>  > a\n> > b\n> \n", id="nested"),
+    param(BlockQuote("a", "b", sep="\n", multiline=True), ">>> a\nb", id="separator"),
+    param(BlockQuote("a", CodeBlock("c").freeze(), multiline=True), ">>> a ```\nc\n```", id="frozen_child"),
+]
+
+
+@mark.parametrize("node,expected", multiline_test_data)
+def test_render_multiline_quote(node, expected):
+    assert str(node) == expected
+    assert node.rendered_length() == len(expected)
+    assert "".join(node.iter_render()) == expected
+
+
+def test_render_multiline_quote_frozen():
+    quote = BlockQuote("a\nb", multiline=True).freeze()
+    assert str(quote) == ">>> a\nb"
+    assert quote.rendered_length() == len(">>> a\nb")
+    assert "".join(quote.iter_render()) == ">>> a\nb"
+    assert str(StyledText(quote, "after")) == "> a\n> b\n after"
+    node = StyledText("before", BlockQuote("a\nb", multiline=True)).freeze()
+    assert str(node) == "before >>> a\nb"
+    assert str(StyledText(node, "after")) == "before > a\n> b\n after"
+
+
+def test_render_multiline_quote_shared():
+    quote = BlockQuote("a\nb", multiline=True)
+    node = StyledText(quote, "middle", quote, sep="\n")
+    expected = "> a\n> b\n\nmiddle\n>>> a\nb"
+    assert str(node) == expected
+    assert node.rendered_length() == len(expected)
+    assert "".join(node.iter_render()) == expected
+
+
+compact_test_data = [
+    param(StyledText("a", "b"), id="styledtext"),
+    param(Bold("a"), id="bold"),
+    param(BlockQuote("a\nb"), id="blockquote"),
+    param(CodeBlock("a", "py"), id="codeblock"),
+    param(TitledURL("a", "https://miaow.io"), id="titledurl"),
+    param(NonEmbeddingURL("https://miaow.io"), id="nonembeddingurl"),
+    param(UserMention(1234, nickname=True), id="usermention"),
+    param(RoleMention(1234), id="rolemention"),
+    param(ChannelMention(1234), id="channelmention"),
+    param(TimeStamp(1234, TimeStyle.Relative), id="timestamp"),
+]
+
+
+@mark.parametrize("node", compact_test_data)
+def test_node_compact(node):
+    assert not hasattr(node, "__dict__")
+    assert str(pickle.loads(pickle.dumps(node))) == str(node)
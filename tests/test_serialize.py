@@ -0,0 +1,157 @@
+"""
+discord-styled-text - test_serialize.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import pickle
+
+from pytest import param, mark, raises
+
+from discord_styler import (StyledText, Italic, Bold, Underline, Strikethrough, InlineCode, Spoiler, BlockQuote,
+                            CodeBlock, TitledURL, NonEmbeddingURL, LinkList, UserMention, RoleMention, ChannelMention,
+                            TimeStamp, TimeStyle, Slot, to_tuple, from_tuple, to_bytes, from_bytes)
+
+
+class Angled:
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return "<" + self.text + ">"
+
+
+tuple_test_data = [
+    param(Bold("Hi", UserMention(1234)), (2, " ", False, "Hi", (11, 1234, False)), id="bold"),
+    param(StyledText(Italic("a"), Underline("b"), Strikethrough("c"), InlineCode("d"), Spoiler("e"), sep=""),
+          (0, "", False, (1, " ", False, "a"), (3, " ", False, "b"), (4, " ", False, "c"), (5, " ", False, "d"),
+           (6, " ", False, "e")), id="styles"),
+    param(BlockQuote("a\nb", multiline=True), (7, " ", False, True, "a\nb"), id="blockquote"),
+    param(CodeBlock("x = 1", "py"), (8, "x = 1", "py"), id="codeblock"),
+    param(TitledURL(Bold("t"), "https://miaow.io"), (9, (2, " ", False, "t"), "https://miaow.io"), id="titledurl"),
+    param(NonEmbeddingURL("https://miaow.io"), (10, "https://miaow.io"), id="nonembeddingurl"),
+    param(StyledText(UserMention(1, nickname=True), RoleMention(2), ChannelMention(3)),
+          (0, " ", False, (11, 1, True), (12, 2), (13, 3)), id="mentions"),
+    param(StyledText(TimeStamp(5), TimeStamp(6, TimeStyle.Relative)), (0, " ", False, (14, 5, None), (14, 6, "R")),
+          id="timestamps"),
+    param(LinkList([("a", "https://miaow.io"), (Bold("b"), "https://miaow.io")]),
+          (15, "\n", "[a](https://miaow.io)", (9, (2, " ", False, "b"), "https://miaow.io")), id="linklist"),
+    param(Bold("*a*", escape=True), (2, " ", True, "*a*"), id="escape"),
+    param(StyledText(Bold("f").freeze(), 42, None), (0, " ", False, (16, "**f**"), (16, "42"), (16, "None")),
+          id="frozen_and_objects"),
+]
+
+
+@mark.parametrize("node,expected", tuple_test_data)
+def test_to_tuple(node, expected):
+    encoded = to_tuple(node)
+    assert encoded == expected
+    text = str(node)
+    assert str(from_tuple(pickle.loads(pickle.dumps(encoded)))) == text
+
+
+raw_test_data = [
+    param(TitledURL(Bold("[x]").freeze(), "https://miaow.io"), id="frozen_title"),
+    param(TitledURL(Bold("[x]"), "https://miaow.io").freeze(), id="frozen_link"),
+    param(StyledText(Bold("*a*").freeze(), "*b*", escape=True), id="frozen_in_escaped"),
+    param(Italic(BlockQuote("a\nb").freeze(), "c"), id="frozen_quote"),
+    param(BlockQuote("a\nb", multiline=True).freeze(), id="frozen_multiline_quote"),
+    param(StyledText(BlockQuote("a\nb", multiline=True).freeze(), "c"), id="frozen_multiline_quote_inside"),
+    param(StyledText(Angled("[*x*]"), escape=True), id="object_in_escaped"),
+]
+
+
+@mark.parametrize("node", raw_test_data)
+def test_round_trip_rendered_text(node):
+    # encoded before rendering, which escapes the strings of the node for good
+    encoded, data = to_tuple(node), to_bytes(node)
+    text = str(node)
+    assert str(from_tuple(encoded)) == text
+    assert from_tuple(encoded).rendered_length() == len(text)
+    assert str(from_bytes(data)) == text
+
+
+def test_to_tuple_other_nodes():
+    slot = Slot("name")
+    encoded = to_tuple(Bold(slot))
+    assert encoded[3] is slot
+    assert str(from_tuple(encoded)) == "**{name}**"
+
+
+def test_to_tuple_deep():
+    node = StyledText("x")
+    for _ in range(5_000):
+        node = BlockQuote(Bold(node, "y\nz"))
+    encoded = pickle.dumps(to_tuple(node))
+    assert str(from_tuple(pickle.loads(encoded))) == str(node)
+
+
+def test_to_tuple_smaller():
+    nodes = [StyledText(Bold("Hi", UserMention(i)), TimeStamp(i, TimeStyle.Relative), escape=True) for i in range(100)]
+    assert len(pickle.dumps([to_tuple(node) for node in nodes])) * 2 < len(pickle.dumps(nodes))
+
+
+@mark.parametrize("node,expected", tuple_test_data)
+def test_to_bytes(node, expected):
+    data = to_bytes(node)
+    assert data.startswith(b"DST\x01")
+    assert str(from_bytes(data)) == str(node)
+
+
+bytes_test_data = [
+    param("plain", id="string"),
+    param(42, id="object"),
+    param(StyledText(UserMention(-5), TimeStamp(-1618953630, TimeStyle.LongDate), RoleMention(2 ** 70)), id="integers"),
+    param(BlockQuote("a\nb", BlockQuote("c"), sep="\n", escape=True, multiline=True), id="blockquote_flags"),
+    param(StyledText("\u200b\U0001f431 \ud800", CodeBlock("")), id="unicode"),
+]
+
+
+@mark.parametrize("node", bytes_test_data)
+def test_to_bytes_values(node):
+    assert str(from_bytes(to_bytes(node))) == str(node)
+
+
+def test_to_bytes_dedup():
+    footer = StyledText(Bold("Sent by"), UserMention(1234), TimeStamp(1618953630, TimeStyle.Relative))
+    single = len(to_bytes(StyledText("report", footer)))
+    node = StyledText(*(StyledText("report", footer) for _ in range(100)), sep="\n")
+    data = to_bytes(node)
+    assert len(data) < single + 2 * 100 + 10
+    decoded = from_bytes(data)
+    assert str(decoded) == str(node)
+    assert decoded._objs[0] is decoded._objs[1]
+
+
+def test_to_bytes_deep():
+    node = StyledText("x")
+    for _ in range(5_000):
+        node = BlockQuote(Bold(node, "y\nz"))
+    assert str(from_bytes(to_bytes(node))) == str(node)
+
+
+def test_to_bytes_smaller_than_pickle():
+    nodes = StyledText(*(StyledText(Bold("Hi", UserMention(i)), TimeStamp(i, TimeStyle.Relative)) for i in range(100)))
+    assert len(to_bytes(nodes)) * 4 < len(pickle.dumps(nodes))
+
+
+def test_to_bytes_errors():
+    with raises(ValueError):
+        to_bytes(Bold(Slot("name")))
+    data = to_bytes(Bold("Hi", UserMention(1234)))
+    for broken in (b"", b"DST", b"XYZ" + data[3:], data[:3] + b"\x02" + data[4:], data[:-1], data[:-2] + data[-1:],
+                   data[:4] + b"\x42\xfe"):
+        with raises(ValueError):
+            from_bytes(broken)
+
+
+def test_from_bytes_wrong_field_types():
+    # the string "a", then Bold("a")
+    records = b"DST\x01" + b"\xff\x01a" + b"\x02\x00\x00\x01\x00"
+    # a code block, and a bold node with the bold node as their code and separator
+    for broken in (b"\x08\x01\x00", b"\x02\x01\x00\x01\x00"):
+        with raises(ValueError):
+            from_bytes(records + broken + b"\xfe")
+    assert str(from_bytes(records + b"\x08\x00\x00\xfe")) == "```a\na\n```"
@@ -0,0 +1,125 @@
+"""
+discord-styled-text - test_table.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from pytest import param, mark, raises
+
+from discord_styler import (Table, CodeBlock, StyledText, Bold, BlockQuote, paginate, to_tuple, from_tuple, to_bytes,
+                            from_bytes, render_many)
+
+
+table_test_data = [
+    param(Table([("miaowware", 1200), ("0x5c", 45)], header=("Name", "Score"), align="<>"),
+          "```\nName       Score\n---------  -----\nmiaowware   1200\n0x5c          45\n```", id="header"),
+    param(Table([("a", "b"), ("ccc",)]), "```\na    b\nccc\n```", id="missing_cells"),
+    param(Table([("a", "bb"), ("ccc", "d")], align="^^", sep=" | "), "```\n a  | bb\nccc | d\n```", id="centered"),
+    param(Table([("x\ny", "```")], lang="txt"), "```txt\nx y  ``\u200b`\n```", id="cells_cleaned"),
+    param(Table([]), "```\n\n```", id="empty"),
+    param(Table([], header=("a", "b")), "```\na  b\n-  -\n```", id="only_header"),
+]
+
+
+@mark.parametrize("table,expected", table_test_data)
+def test_Table(table, expected):
+    assert str(table) == expected
+    assert table.rendered_length() == len(expected)
+    assert "".join(table.iter_render()) == expected
+
+
+def test_Table_empty_like_CodeBlock():
+    assert str(Table([])) == str(CodeBlock(""))
+    assert isinstance(Table([]), CodeBlock)
+
+
+def test_Table_wide_characters():
+    table = Table([("東京", "x"), ("é", "日本語"), ("é", "a\u200bb")], header=("city", "name"))
+    assert table.widths == (4, 6)
+    assert str(table) == "```\ncity  name\n----  ------\n東京  x\né     日本語\né     a\u200bb\n```"
+
+
+def test_Table_rows_read_once():
+    rows = iter([(1, 2), (3, 4)])
+    table = Table(rows)
+    assert str(table) == "```\n1  2\n3  4\n```"
+    assert str(table) == "```\n1  2\n3  4\n```"
+    assert list(table.pages()) == ["```\n1  2\n3  4\n```"]
+
+
+def test_Table_widths_cached():
+    table = Table([("a", "bb")])
+    assert table.widths is table.widths
+
+
+def test_Table_invalid_align():
+    with raises(ValueError):
+        Table([], align="<|")
+
+
+def test_Table_in_nodes():
+    table = Table([("a", 1)])
+    assert str(StyledText(Bold("Scores"), table, sep="\n")) == "**Scores**\n```\na  1\n```"
+    assert str(BlockQuote(table)) == "> ```\n> a  1\n> ```\n"
+
+
+@mark.parametrize("limit", [80, 100, 300, 2000])
+def test_Table_pages(limit):
+    table = Table(((i, "row" * (i % 4), i * i) for i in range(200)), header=("n", "name", "square"), align=">")
+    pages = list(table.pages(limit))
+    header = "```\n  n  name       square\n---  ---------  ------\n"
+    assert str(table).startswith(header)
+    rows = []
+    for page in pages:
+        assert len(page) <= limit
+        assert page.startswith(header)
+        assert page.endswith("\n```")
+        rows += page[len(header):-4].split("\n")
+    assert rows == str(table)[len(header):-4].split("\n")
+    # as many rows as fit on each page
+    for page, next_page in zip(pages, pages[1:]):
+        assert len(page) + len(next_page[len(header):].split("\n")[0]) + 1 > limit
+
+
+def test_Table_pages_too_small():
+    table = Table([("a", "long row")], header=("x", "y"))
+    with raises(ValueError):
+        list(table.pages(10))
+    with raises(ValueError):
+        list(table.pages(20))
+    assert list(Table([]).pages(8)) == ["```\n\n```"]
+
+
+def test_Table_paginate():
+    table = Table((("row", i) for i in range(500)))
+    for page in paginate(table):
+        assert page.startswith("```\n") and page.endswith("\n```")
+
+
+def test_Table_from_file():
+    with raises(ValueError):
+        Table.from_file(b"a\nb")
+
+
+@mark.parametrize("table", [
+    param(Table([("miaowware", 1200), ("0x5c", 45)], header=("Name", "Score"), align="<>", sep=" | "), id="header"),
+    param(Table([("x\ny", "```")], lang="txt"), id="cells_cleaned"),
+    param(Table([(), ("a",)]), id="empty_row"),
+    param(Table([]), id="empty"),
+])
+def test_Table_serialize(table):
+    text = str(table)
+    assert str(from_tuple(to_tuple(table))) == text
+    assert str(from_bytes(to_bytes(table))) == text
+    assert str(pickle.loads(pickle.dumps(table))) == text
+
+
+def test_Table_in_processes():
+    tables = [Table((i, j) for j in range(3)) for i in range(3)]
+    with ProcessPoolExecutor(2) as pool:
+        assert render_many(tables, pool) == [str(table) for table in tables]
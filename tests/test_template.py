@@ -0,0 +1,63 @@
+"""
+discord-styled-text - test_template.py
+---
+Copyright 2021 classabbyamp, 0x5c
+Released under the terms of the BSD 3-Clause license.
+"""
+
+
+from pytest import raises
+
+from discord_styler import (StyledText, Bold, InlineCode, BlockQuote, TitledURL, UserMention, TimeStamp, TimeStyle,
+                            Slot, Template)
+
+
+def build(user, time, code, note):
+    return StyledText(Bold("Reminder for"), user, "at", time, InlineCode(code), BlockQuote(note), sep=" ")
+
+
+def test_Template_render():
+    template = Template(build(Slot("user"), Slot("time"), Slot("code"), Slot("note")))
+    values = dict(user=UserMention(1234), time=TimeStamp(5678, TimeStyle.Relative), code="x = 1", note="a\nb")
+    assert template.render(**values) == str(build(**values))
+    assert template.names == ["user", "time", "code", "note"]
+
+
+def test_Template_render_many():
+    template = Template(StyledText(Slot("greeting", escape=True), Slot("name", escape=True), Slot("greeting")))
+    rows = [dict(greeting="*hi*", name=f"user_{i}") for i in range(3)]
+    assert template.render_many(rows) == [f"\\*hi\\* user\\_{i} *hi*" for i in range(3)]
+
+
+def test_Template_nodes_not_escaped():
+    template = Template(StyledText(Slot("value", escape=True)))
+    assert template.render(value=Bold("x")) == "**x**"
+
+
+def test_Template_link_title():
+    template = Template(TitledURL(Slot("title"), "https://miaow.io"))
+    assert template.render(title="home") == "[home](https://miaow.io)"
+
+
+def test_Template_frozen_literal():
+    template = Template(StyledText(Bold("header").freeze(), Slot("body")))
+    assert template.render(body="text") == "**header** text"
+
+
+def test_Template_missing_value():
+    with raises(KeyError):
+        Template(StyledText(Slot("value"))).render()
+
+
+def test_Slot_str():
+    assert str(StyledText("hello", Slot("name"))) == "hello {name}"
+
+
+def test_Template_link_title_checked():
+    template = Template(TitledURL(Slot("title"), "https://a.io"))
+    assert template.render(title="[evil](https://x)") == "[\\[evil\\](https://x)](https://a.io)"
+    assert template.render(title="[evil](https://x)") == str(TitledURL("[evil](https://x)", "https://a.io"))
+    assert template.render(title=Bold("[x]")) == str(TitledURL(Bold("[x]"), "https://a.io"))
+    assert template.render(title="a\\") == str(TitledURL("a\\", "https://a.io")) == "[a\\\\](https://a.io)"
+    escaped = Template(TitledURL(Slot("title", escape=True), "https://a.io"))
+    assert escaped.render(title="[*x*]") == "[\\[\\*x\\*\\]](https://a.io)"
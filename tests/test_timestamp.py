@@ -6,9 +6,10 @@ Released under the terms of the BSD 3-Clause license.
 """
 
 
+from array import array
 from datetime import datetime, timezone, timedelta
 
-from pytest import param, mark, raises
+from pytest import param, mark, raises, importorskip
 
 from discord_styler import TimeStamp, TimeStyle
 
@@ -25,6 +26,7 @@ UserMention_test_data = [
     param(datetime.fromtimestamp(123456789), None, "<t:123456789>", id="datetime_naive"),
     param(datetime.fromtimestamp(123456789, tz=timezone(timedelta(hours=4))), None,
           "<t:123456789>", id="datetime_with_tz"),
+    param(True, None, "<t:1>", id="bool"),
 ]
 
 
@@ -44,3 +46,41 @@ TimeStamp_exception_test_data = [
 def test_TimeStamp_exception(time):
     with raises(ValueError):
         TimeStamp(time=time)
+
+
+def test_TimeStamp_rounding():
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    assert str(TimeStamp(epoch + timedelta(seconds=1, microseconds=499999))) == "<t:1>"
+    assert str(TimeStamp(epoch + timedelta(seconds=1, microseconds=500000))) == "<t:2>"
+    assert str(TimeStamp(epoch + timedelta(seconds=2, microseconds=500000))) == "<t:2>"
+    assert str(TimeStamp(epoch - timedelta(microseconds=600000))) == "<t:-1>"
+
+
+def test_TimeStamp_far_future():
+    time = 2 ** 62 + 1  # beyond what a float can represent exactly
+    assert str(TimeStamp(time, TimeStyle.Relative)) == f"<t:{time}:R>"
+
+
+format_many_test_data = [
+    param([1, 22, 333], None, ["<t:1>", "<t:22>", "<t:333>"], id="list"),
+    param(array("q", [123456789, -5]), TimeStyle.LongDate, ["<t:123456789:D>", "<t:-5:D>"], id="array"),
+    param((t for t in [7]), TimeStyle.Relative, ["<t:7:R>"], id="generator"),
+    param([], None, [], id="empty"),
+    param([True, 2], None, ["<t:1>", "<t:2>"], id="bool"),
+]
+
+
+@mark.parametrize("times,style,expected", format_many_test_data)
+def test_TimeStamp_format_many(times, style, expected):
+    assert TimeStamp.format_many(times, style) == expected
+
+
+def test_TimeStamp_format_many_numpy():
+    numpy = importorskip("numpy")
+    times = numpy.array([123456789, 987654321], dtype=numpy.int64)
+    assert TimeStamp.format_many(times, TimeStyle.ShortTime) == ["<t:123456789:t>", "<t:987654321:t>"]
+
+
+def test_TimeStamp_format_many_exception():
+    with raises(ValueError):
+        TimeStamp.format_many([1, 4.20])
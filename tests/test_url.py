@@ -8,7 +8,8 @@ Released under the terms of the BSD 3-Clause license.
 
 from pytest import param, mark, raises
 
-from discord_styler import TitledURL, NonEmbeddingURL
+from discord_styler import TitledURL, NonEmbeddingURL, LinkList, Bold
+from discord_styler.styler import _checked_url
 
 
 TitledURL_test_data = [
@@ -18,6 +19,13 @@ TitledURL_test_data = [
     param("check this out", "http://miaow.io", "[check this out](http://miaow.io)", id="http_with_title"),
     param("check this out", "https://miaow.io", "[check this out](https://miaow.io)", id="https_with_title"),
     param("check this out", "steam://friends/", "[check this out](steam://friends/)", id="steam_with_title"),
+    param("HTTP", "HTTPS://miaow.io", "[HTTP](HTTPS://miaow.io)", id="uppercase_scheme"),
+    param("[1] see", "https://miaow.io/a (b)", "[\\[1\\] see](https://miaow.io/a%20%28b%29)", id="sanitized"),
+    param("a\\]b\\\\]", "https://miaow.io", "[a\\]b\\\\\\]](https://miaow.io)", id="already_escaped"),
+    param("a\\", "https://miaow.io", "[a\\\\](https://miaow.io)", id="final_backslash"),
+    param("a\\\\\\", "https://miaow.io", "[a\\\\\\\\](https://miaow.io)", id="final_backslashes"),
+    param("a\\\\", "https://miaow.io", "[a\\\\](https://miaow.io)", id="final_escaped_backslash"),
+    param(Bold("[b]"), "https://miaow.io", "[**[b]**](https://miaow.io)", id="node_title"),
 ]
 
 
@@ -31,6 +39,7 @@ NonEmbeddingURL_test_data = [
     param("http://miaow.io", "<http://miaow.io>", id="http"),
     param("https://miaow.io", "<https://miaow.io>", id="https"),
     param("steam://friends/", "<steam://friends/>", id="steam"),
+    param("https://miaow.io/<a>\tb", "<https://miaow.io/%3Ca%3E%09b>", id="sanitized"),
 ]
 
 
@@ -57,3 +66,29 @@ def test_URL_exception(title, url, cls):
             cls(title=title, url=url)
         else:
             cls(url=url)
+
+
+def test_LinkList():
+    links = [("miaowware", "https://miaow.io"), ("[docs]", "https://miaow.io/docs (new)"), (Bold("b"), "HTTPS://x>")]
+    expected = "\n".join(str(TitledURL(title, url)) for title, url in links)
+    assert str(LinkList(links)) == expected
+    assert str(LinkList(links, sep=" | ")) == expected.replace("\n", " | ")
+    assert LinkList(links).rendered_length() == len(expected)
+    assert str(LinkList([])) == ""
+    assert str(LinkList([("a\\", "https://x"), ("b", "https://y")])) == "[a\\\\](https://x)\n[b](https://y)"
+
+
+def test_LinkList_exception():
+    with raises(ValueError):
+        LinkList([("fine", "https://miaow.io"), ("broken", "ftp://miaow.io")])
+
+
+def test_URL_validation_cached():
+    url = "https://miaow.io/cached"
+    LinkList([("a", url)] * 100)
+    before = _checked_url.cache_info()
+    LinkList([("a", url)] * 100)
+    NonEmbeddingURL(url)
+    after = _checked_url.cache_info()
+    assert after.hits - before.hits == 101
+    assert after.misses == before.misses